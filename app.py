@@ -1,46 +1,65 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import joblib
+import io
+
+from churnguard.analytics import get_analytics, get_analytics_stream
+from churnguard.charts import draw_contracts, draw_density, draw_payments, draw_segments, draw_services, render_png
+from churnguard.config import DEFAULT_DATA_PATH, FEATURES_PATH, MODEL_PATH, N_JOBS, STREAMED_UPLOAD_MB
+from churnguard.export import available_formats, export_bytes, export_filename, export_mime
+from churnguard.ingestion import check_data_quality, content_digest, load_telco_csv, read_header
+from churnguard.jobs import CANCELLED, FAILED, QUEUED, JobManager
+from churnguard.optimizer import DEFAULT_OFFERS, optimize_offers, plan_summary, score_offers
+from churnguard.parallel import ParallelScorer
+from churnguard.profiling import StageProfiler
+from churnguard.registry import ModelCache, ModelRegistry
+from churnguard.report import KEEP_THRESHOLD, scan_risk_report
+from churnguard.scenarios import Scenario, ScenarioEngine, scenario_grid
+from churnguard.score_store import IncrementalScorer, ScoreStore, model_version
+from churnguard.sketches import load_stats
+from churnguard.startup import boot, plotting
+from churnguard.streaming import DEFAULT_CHUNKSIZE
 
 # --- SAYFA YAPILANDIRMASI ---
 # Uygulama başlığı ve geniş ekran modunu ayarlar
 st.set_page_config(page_title="Dynamic Churn Intelligence", layout="wide")
 
+# --- PERFORMANS PROFİLİ ---
+# Kenar çubuğundaki anahtar açıkken her yeniden çalıştırmada aşama süreleri ölçülür ve
+# sayfanın sonunda gösterilir; kapalıyken ölçüm yapılmaz
+profiler = StageProfiler(enabled=st.session_state.get('profil_paneli', False))
+
 # --- 1. MODEL VE VARSAYILAN VERİLERİN YÜKLENMESİ ---
 @st.cache_resource # Sayfa her yenilendiğinde modelin tekrar yüklenip yavaşlamasını engeller
-def load_assets():
-    try:
-        # Önceden eğitilmiş model ve özellik (feature) listesini yükler
-        model = joblib.load('churn_model_v2_recall73.pkl')
-        features = joblib.load('features_v2.pkl')
-        return model, features
-    except:
-        return None, None
-
-model, features = load_assets()
-
-def check_data_quality(df):
-    """Yüklenen verideki kritik eksikleri ve veri sağlığını denetler."""
-    errors = []
-    # Analizlerin çalışması için veri setinde mutlaka bulunması gereken sütunlar
-    required = ['tenure', 'MonthlyCharges', 'Contract', 'Churn', 'InternetService', 'TechSupport', 'PaymentMethod']
-    
-    # Sütun varlık kontrolü
-    missing = [col for col in required if col not in df.columns]
-    if missing:
-        errors.append(f"❌ Eksik Sütunlar: {', '.join(missing)}")
-    
-    # Boş (NaN) değer kontrolü
-    if df.isnull().any().any():
-        errors.append("⚠️ Veride boş (NaN) değerler var. Analizler tam doğru olmayabilir.")
-        
-    # Veri tipi kontrolü (Abonelik süresi sayısal olmalıdır)
-    if 'tenure' in df.columns and not pd.api.types.is_numeric_dtype(df['tenure']):
-        errors.append("❌ 'tenure' sütunu sayısal olmalıdır.")
-        
-    return errors
+def load_model_cache():
+    # Kayıttaki modeller ilk kullanıldıklarında yüklenip ısıtılır; en son
+    # kullanılan birkaç model bellek bütçesi dahilinde süreç genelinde tutulur
+    return ModelCache(ModelRegistry())
+
+model_cache = load_model_cache()
+model_entries = {entry.model_id: entry for entry in model_cache.registry.entries()}
+
+# Aktif model oturum bazında seçilir (bölge modelleri, A/B sürümleri)
+if model_entries:
+    aktif_model = st.sidebar.selectbox("🧠 Aktif Model", list(model_entries), key="aktif_model",
+                                       format_func=lambda model_id: model_entries[model_id].label)
+    model_entry = model_entries[aktif_model]
+    assets = profiler.timed('Model', model_cache.get, aktif_model)
+else:
+    aktif_model = model_entry = None
+    assets = boot(MODEL_PATH, FEATURES_PATH, warmup=False)
+
+model, features = assets.model, assets.features
+# Özellik listesinden bir kez derlenen ortak kodlayıcı (toplu ve tekil tahmin aynı yolu kullanır)
+encoder = assets.encoder
+# Tekil müşteri ve senaryo ızgaraları gibi küçük girdiler düz dizili derlenmiş ormanla skorlanır
+scenario_engine = ScenarioEngine(encoder, assets.score_fn) if model is not None and encoder is not None else None
+
+for hata in assets.report.errors:
+    st.sidebar.error(f"⚠️ {hata}")
+# Model gerektiren bölümler model yüklenemediğinde bu açılış hatasını gösterir
+model_hatasi = "⚠️ Model yüklenemedi: " + ("; ".join(assets.report.errors) or "kayıtlı model bulunamadı.")
+st.sidebar.caption(f"⏱️ {assets.report.summary()}")
 
 # --- SIDEBAR EN ÜST BOŞLUĞA YERLEŞTİRME (CSS HACK) ---
 # Streamlit'in sidebar üst boşluğunu kaldırarak logoyu en tepeye taşır
@@ -65,10 +84,22 @@ st.sidebar.markdown("""
 st.sidebar.header("📁 Veri Yönetimi")
 uploaded_file = st.sidebar.file_uploader("Yeni Şirket Veri Setinizi Yükleyin (CSV)", type="csv")
 
+# Büyük yüklemeler DataFrame olarak belleğe alınmaz: kalite kontrolü, KPI'lar ve grafik
+# verileri dosya üzerinde iki parçalı geçişte hesaplanır (tarama zaten parça parça çalışır)
+akisli = uploaded_file is not None and uploaded_file.size > STREAMED_UPLOAD_MB * 1e6
+stream_analytics = None
+portfoy_bellek_notu = (f"ℹ️ Bu bölüm tüm portföyü bellekte skorlar; {STREAMED_UPLOAD_MB:,.0f} MB üstündeki yüklemelerde "
+                       "kapalıdır. Yüksek riskli müşteriler için Operasyonel Liste taramasını kullanın.")
+
+if akisli:
+    stream_analytics, quality_issues = profiler.timed('Veri Okuma + KPI (akışlı)', get_analytics_stream,
+                                                      uploaded_file, content_digest(uploaded_file))
+    temp_df = read_header(uploaded_file) # Yalnızca sütun adları; satırlar belleğe alınmaz
+elif uploaded_file is not None:
+    temp_df = profiler.timed('Veri Okuma', load_telco_csv, uploaded_file) # Veriyi şemalı okur (aynı dosya tekrar ayrıştırılmaz)
+    quality_issues = profiler.timed('Veri Kalitesi', check_data_quality, temp_df) # Kalite kontrolü yapar
+
 if uploaded_file is not None:
-    temp_df = pd.read_csv(uploaded_file) # Veriyi geçici olarak belleğe alır
-    quality_issues = check_data_quality(temp_df) # Kalite kontrolü yapar
-    
     if quality_issues:
         for err in quality_issues:
             st.sidebar.error(err)
@@ -78,57 +109,70 @@ if uploaded_file is not None:
     else:
         df = temp_df # Hata yoksa ana dataframe'e aktarır
         st.sidebar.success("✅ Veri seti başarıyla doğrulandı.")
+        if akisli:
+            st.sidebar.info(f"ℹ️ Büyük dosya ({uploaded_file.size / 1e6:,.0f} MB): veri belleğe alınmadan parça parça "
+                            "analiz edildi. Medyan tabanlı değerler tahminidir; portföy genelinde teklif ve senaryo "
+                            "analizleri kapalıdır.")
 else:
     # Kullanıcı dosya yüklemediyse varsayılan eğitim verisini yüklemeye çalışır
     try:
-        df = pd.read_csv('WA_Fn-UseC_-Telco-Customer-Churn.csv') 
+        df = profiler.timed('Veri Okuma', load_telco_csv, DEFAULT_DATA_PATH)
         st.sidebar.info("ℹ️ Eğitim veri seti üzerinden analiz yapılıyor.")
-    except:
+    except OSError:
         df = pd.DataFrame()
 
 # --- GÜVENLİK BARİYERİ ---
 # Veri seti yoksa veya hatalıysa uygulamanın analiz kısımlarını göstermez
-if df.empty:
+veri_yok = df.empty and stream_analytics is None
+if veri_yok:
     st.info("👋 Hoş Geldiniz! Lütfen analizleri başlatmak için sol menüden geçerli ve hatasız bir veri seti yükleyin.")
     st.stop()
 
 # --- DİNAMİK ANALİTİK HESAPLAMALAR ---
-# Veri üzerinden kritik eşik ve terk oranlarını hesaplar
-if not df.empty and 'MonthlyCharges' in df.columns and 'Churn' in df.columns:
-    churn_yes = df[df['Churn'] == 'Yes']
-    kritik_esik = churn_yes['MonthlyCharges'].median()
-    genel_churn_orani = (df['Churn'] == 'Yes').mean() * 100
-    contract_churn = df.groupby('Contract')['Churn'].apply(lambda x: (x == 'Yes').mean() * 100)
-    en_riskli_sozlesme = contract_churn.idxmax() if not contract_churn.empty else "Bilinmiyor"
-else:
-    # Veri seti gelmezse hata almamak için fallback değerleri
-    kritik_esik = 79.65
-    genel_churn_orani = 26.5
-    contract_churn = pd.Series({'Month-to-month': 42.7, 'One year': 11.2, 'Two year': 2.8})
-    en_riskli_sozlesme = "Aylık"
-
-# --- TOPLU TAHMİN FONKSİYONU ---
-def run_batch_prediction(df, model, features):
-    """Tüm portföyü tarayarak risk skorlarını topluca üretir."""
-    X_batch = pd.DataFrame(0, index=df.index, columns=features)
-    
-    # Sayısal değer aktarımı
-    if 'tenure' in features: X_batch['tenure'] = df['tenure']
-    if 'MonthlyCharges' in features: X_batch['MonthlyCharges'] = df['MonthlyCharges']
-    if 'TotalCharges' in features: X_batch['TotalCharges'] = df['tenure'] * df['MonthlyCharges']
-    
-    # Kategorik değerlerin One-Hot Encoding formatına eşlenmesi
-    cat_cols = ['Contract', 'InternetService', 'TechSupport', 'PaymentMethod']
-    for col in cat_cols:
-        if col in df.columns:
-            for val in df[col].unique():
-                feat_name = f"{col}_{val}"
-                if feat_name in features:
-                    X_batch.loc[df[col] == val, feat_name] = 1
-                    
-    # Olasılık skorlarını döndürür
-    probs = model.predict_proba(X_batch)[:, 1]
-    return probs
+# Kritik eşik, terk oranları, segmentler ve grafik verileri veri setinin içerik
+# özetine göre bir kez hesaplanır; widget kaynaklı yeniden çalıştırmalarda önbellekten gelir.
+analytics = stream_analytics if akisli else profiler.timed('KPI + Segmentasyon', get_analytics, df)
+kritik_esik = analytics.kritik_esik
+genel_churn_orani = analytics.genel_churn_orani
+contract_churn = analytics.contract_churn
+en_riskli_sozlesme = analytics.en_riskli_sozlesme
+
+@st.cache_resource
+def load_score_store():
+    """Artımlı tarama için süreç genelinde paylaşılan skor deposu."""
+    return ScoreStore()
+
+@st.cache_resource
+def load_job_manager():
+    """Süreç genelinde paylaşılan tarama işçi havuzu; her oturumun işi kendi oturum durumunda tutulur."""
+    return JobManager()
+
+@st.fragment(run_every=1.0)
+def scan_job_status():
+    """Oturumun taramasının durumunu saniyede bir tazeler; iş bitince sayfayı yeniden çizer."""
+    job = st.session_state.get('scan_job')
+    if job is None or job.done:
+        st.rerun()
+    if job.status == QUEUED:
+        sira = load_job_manager().queue_position(job)
+        st.info(f"⏳ Tarama sırada bekliyor ({sira}. sırada); diğer oturumların taramaları bitince başlayacak.")
+    else:
+        p = job.progress
+        eta = f", kalan ~{job.eta:.0f} sn" if job.eta is not None else ""
+        st.progress(p.fraction, text=f"Analiz ediliyor... {p.rows:,} müşteri tarandı, {p.kept:,} riskli{eta}")
+    if st.button("⏹️ Taramayı İptal Et", disabled=job.cancel_requested):
+        job.cancel()
+
+@st.cache_data(max_entries=4, show_spinner="Teklif senaryoları skorlanıyor...")
+def load_offer_scores(fingerprint, model_id, _df):
+    """Portföyü aday teklifler altında skorlar; veri seti parmak izi ve model başına bir kez çalışır."""
+    return score_offers(scenario_engine, _df, DEFAULT_OFFERS)
+
+def cached_chart(name, draw):
+    """Grafiği veri seti özeti başına bir kez PNG'ye çizer; sonraki çalıştırmalar diskteki görüntüyü kullanır."""
+    with profiler.stage(f"Grafik: {name}"):
+        png = render_png(f"{analytics.fingerprint}-{name}", lambda: draw(*plotting()))
+    st.image(png, width='stretch')
 
 # Tablo sütunlarını Türkçeleştirmek için mapping sözlüğü
 column_mapping = {
@@ -141,11 +185,14 @@ column_mapping = {
     'TechSupport': 'Teknik Destek',
     'PaymentMethod': 'Ödeme Yöntemi',
     'CLV': 'Müşteri Ömür Boyu Değeri ($)',
-    'Segment': 'Değer Segmenti'
+    'Segment': 'Değer Segmenti',
+    'Risk_Etkenleri': 'Başlıca Risk Etkenleri (puan)'
 }
 
 # --- 3. ANA PANEL TASARIMI (TABS) ---
-tab1, tab2, tab3, tab4 = st.tabs(["🎯 Tahmin Paneli", "📊 Genel Şirket Analizi", "🚀 Aksiyon ve Strateji Merkezi", "📋 Operasyonel Liste"])
+# Sekme seçimi sunucuda izlenir; grafik kütüphaneleri yalnızca analiz sekmesi açıldığında yüklenir
+tab1, tab2, tab3, tab4 = st.tabs(["🎯 Tahmin Paneli", "📊 Genel Şirket Analizi", "🚀 Aksiyon ve Strateji Merkezi", "📋 Operasyonel Liste"],
+                                 key="aktif_sekme", on_change="rerun")
 
 # --- TAB 1: BİREYSEL MÜŞTERİ ANALİZİ ---
 with tab1:
@@ -163,20 +210,13 @@ with tab1:
                                              ["Electronic check", "Mailed check", 
                                               "Bank transfer (automatic)", "Credit card (automatic)"])
 
-        # Model girdisini oluşturur
-        input_df = pd.DataFrame(0, index=[0], columns=features)
-        if 'tenure' in features: input_df['tenure'] = tenure
-        if 'MonthlyCharges' in features: input_df['MonthlyCharges'] = monthly_charges
-        if 'TotalCharges' in features: input_df['TotalCharges'] = tenure * monthly_charges
-        
-        # Seçilen kategorik verileri işaretler
-        for col in [f"Contract_{contract}", f"InternetService_{internet}", 
-                    f"TechSupport_{tech_support_val}", f"PaymentMethod_{payment_method}"]:
-            if col in features: input_df[col] = 1
+        # Ham müşteri kaydı; model girdisine ortak kodlayıcı ile dönüştürülür
+        record = {'tenure': tenure, 'MonthlyCharges': monthly_charges, 'Contract': contract,
+                  'InternetService': internet, 'TechSupport': tech_support_val, 'PaymentMethod': payment_method}
             
-        return input_df, contract, monthly_charges, tenure, tech_support_val, payment_method
+        return record, contract, monthly_charges, tenure, tech_support_val, payment_method
 
-    input_df, user_contract, user_charges, user_tenure, tech_support, user_payment = user_input_features()
+    user_record, user_contract, user_charges, user_tenure, tech_support, user_payment = user_input_features()
 
     # Model performans özet bilgisi
     st.sidebar.markdown("---")
@@ -187,43 +227,18 @@ with tab1:
 
     if st.button("🚀 Analizi Başlat ve Aksiyon Üret"):
         if model is not None:
-            # 1. MEVCUT DURUM TAHMİNİ
-            prediction = model.predict(input_df)
-            probability = model.predict_proba(input_df)[0][1]
-            
-            # --- ULTRA SENARYO HESAPLAMA (Birleşik Teklif Etkisi) ---
-            alt_input_ultra = input_df.copy()
-            if 'Contract_One year' in features:
-                alt_input_ultra[[c for c in features if 'Contract' in c]] = 0
-                alt_input_ultra['Contract_One year'] = 1
-            
+            # Mevcut durum, birleşik teklif ve what-if senaryoları ile tam senaryo ızgarası
+            # tek bir matriste toplanıp tek model çağrısıyla skorlanır.
             indirimli_fiyat = round(user_charges * 0.85, 2)
-            alt_input_ultra['MonthlyCharges'] = indirimli_fiyat
-            
-            if 'TechSupport_Yes' in features:
-                alt_input_ultra[[c for c in features if 'TechSupport' in c]] = 0
-                alt_input_ultra['TechSupport_Yes'] = 1
-                
-            if 'TotalCharges' in features:
-                alt_input_ultra['TotalCharges'] = user_tenure * indirimli_fiyat
-            
-            prob_ultra = model.predict_proba(alt_input_ultra)[0][1]
-
-            # --- DİĞER WHAT-IF HESAPLAMALARI ---
-            alt_input_1 = input_df.copy() # Sadece taahhüt
-            if 'Contract_One year' in features:
-                alt_input_1[[c for c in features if 'Contract' in c]] = 0
-                alt_input_1['Contract_One year'] = 1
-            prob_s1 = model.predict_proba(alt_input_1)[0][1]
-
-            alt_input_2 = input_df.copy() # İndirim ve destek
-            alt_input_2['MonthlyCharges'] = indirimli_fiyat
-            if 'TechSupport_Yes' in features:
-                alt_input_2[[c for c in features if 'TechSupport' in c]] = 0
-                alt_input_2['TechSupport_Yes'] = 1
-            if 'TotalCharges' in features:
-                alt_input_2['TotalCharges'] = user_tenure * indirimli_fiyat
-            prob_s2 = model.predict_proba(alt_input_2)[0][1]
+            scenarios = [
+                Scenario("Mevcut Durum"),
+                Scenario("Birleşik Teklif", discount=0.15, contract='One year', tech_support='Yes'),
+                Scenario("Sadece Taahhüt", contract='One year'),
+                Scenario("%15 İndirim + Teknik Destek", discount=0.15, tech_support='Yes'),
+            ] + scenario_grid(payment_methods=(None, 'Credit card (automatic)'))
+            surface = profiler.timed('Tekil Tahmin + Senaryolar', scenario_engine.risk_surface, user_record, scenarios)
+            probability, prob_ultra, prob_s1, prob_s2 = surface['Risk'].iloc[:4]
+            prediction = [int(probability > 0.5)]
 
             # Sonuç Özet Kartları
             st.divider()
@@ -237,7 +252,7 @@ with tab1:
                 if prediction[0] == 1: st.error("🚨 TERK EĞİLİMİ")
                 else: st.success("✅ SADIK PROFİL")
             with col_m3:
-                t_med = df['tenure'].median() if not df.empty else 29
+                t_med = analytics.tenure_med
                 st.markdown("**Müşteri Segmenti**")
                 if user_charges >= kritik_esik and user_tenure < t_med: st.warning("📍 Riskli Yeni Müşteri")
                 elif user_charges >= kritik_esik and user_tenure >= t_med: st.info("📍 VIP Müşteri")
@@ -247,10 +262,15 @@ with tab1:
             c1, c2 = st.columns(2)
             with c1:
                 st.subheader("🧐 Kararı Etkileyen Faktörler")
-                f_imp = {"Sözleşme": 0.45 if user_contract == "Month-to-month" else 0.05,
-                         "Fatura": 0.35 if user_charges > kritik_esik else 0.15,
-                         "Ödeme": 0.20 if user_payment == "Electronic check" else 0.05}
-                st.bar_chart(pd.Series(f_imp))
+                if assets.explainer is not None:
+                    # Modelin bu müşteri için hesapladığı katkılar: taban risk + katkılar = gösterilen risk
+                    taban, katkilar = assets.explainer.explain(encoder.encode_records(user_record))
+                    f_imp = pd.Series(katkilar[0] * 100, index=assets.explainer.labels)
+                    f_imp = f_imp[f_imp.abs().sort_values(ascending=False).index[:6]]
+                    st.bar_chart(f_imp, horizontal=True, sort=False, x_label="Risk Katkısı (puan)")
+                    st.caption(f"Portföy taban riski %{taban*100:.1f}; pozitif katkılar riski artırır, negatifler azaltır.")
+                else:
+                    st.info("Bu model türü için katkı açıklaması sunulamıyor.")
                 
                 # CLV ve Gelecek Değer metrikleri
                 st.write("---")
@@ -263,7 +283,7 @@ with tab1:
                 with col_clv2:
                     st.metric("Gelecek 12 Ay Potansiyeli", f"{future_revenue:,.2f} $")
                 
-                if customer_clv > (df['MonthlyCharges'].mean() * df['tenure'].mean() if not df.empty else 1500):
+                if customer_clv > analytics.clv_referans:
                     st.info("💎 **Yüksek Değerli Müşteri:** Bu müşteriyi elde tutmak, yıllık bazda ciddi bir gelir koruması sağlar.")
 
             with c2:
@@ -305,124 +325,105 @@ with tab1:
                 st.write("**Senaryo 2: %15 İndirim + Teknik Destek**")
                 st.progress(prob_s2); st.write(f"Risk: %{prob_s2*100:.1f}")
 
+            with st.expander("🧮 Tüm Senaryo Izgarası (Risk Yüzeyi)"):
+                grid_df = surface.iloc[4:].sort_values('Risk').reset_index(drop=True)
+                st.dataframe(grid_df.style.format({'İndirim': '{:.0%}', 'Risk': '{:.1%}'}), width='stretch')
+
 # --- TAB 2: ŞİRKET GENEL ANALİZLERİ ---
 with tab2:
     st.title("📊 Şirket Genel Analiz Paneli")
     st.write("Veri setindeki müşteri davranışlarını ve risk dağılımlarını standart ölçümlerle analiz eder.")
 
-    if not df.empty:
+    if not veri_yok:
         # Şirket geneli özet metrikler
         m1, m2, m3, m4 = st.columns(4)
-        m1.metric("Toplam Müşteri", f"{len(df):,}")
+        m1.metric("Toplam Müşteri", f"{analytics.n_customers:,}")
         m2.metric("Genel Terk Oranı", f"%{genel_churn_orani:.1f}")
         m3.metric("Dinamik Kritik Eşik", f"{kritik_esik:.2f} $")
-        m4.metric("Kayıp Müşteri Sayısı", f"{len(df[df['Churn']=='Yes']):,}")
-
-        st.divider()
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("🎯 Müşteri Değer Matrisi")
-            tenure_med = df['tenure'].median()
-            charge_med = df['MonthlyCharges'].median()
-            # Müşterileri segmentlere ayıran fonksiyon
-            def seg_f(row):
-                if row['MonthlyCharges'] >= charge_med and row['tenure'] >= tenure_med: return 'VIP'
-                if row['MonthlyCharges'] >= charge_med and row['tenure'] < tenure_med: return 'Riskli Yeni'
-                if row['MonthlyCharges'] < charge_med and row['tenure'] >= tenure_med: return 'Sadık Eko'
-                return 'Kayıp Adayı'
-            temp_s = df.copy()
-            temp_s['Segment'] = temp_s.apply(seg_f, axis=1)
-            seg_c = temp_s['Segment'].value_counts().reset_index()
-            fig1, ax1 = plt.subplots(figsize=(10, 5))
-            sns.barplot(data=seg_c, x='Segment', y='count', palette='viridis', ax=ax1)
-            st.pyplot(fig1)
-            st.caption("""
-            **Grafik Analizi:** Müşterileri 'Aylık Ücret' ve 'Bağlılık Süresi'ne göre 4 ana segmente ayırır. 
-            * **VIP:** Yüksek gelirli ve sadık kitle. 
-            * **Riskli Yeni:** Yüksek fatura ödeyen ancak henüz şirkete alışmamış, terk ihtimali en yüksek öncelikli grup. 
-            * **Sadık Eko:** Düşük ücretli ama uzun süreli bağlı kitle. 
-            * **Kayıp Adayı:** Hem düşük ücretli hem de yeni olan istikrarsız grup.
-            """)
-
-        with col2:
-            st.subheader("📜 Sözleşme Tipi vs Terk Oranı")
-            c_tr = contract_churn.rename(index={"Month-to-month": "Aylık", "One year": "1 Yıllık", "Two year": "2 Yıllık"})
-            fig2, ax2 = plt.subplots(figsize=(10, 5))
-            sns.barplot(x=c_tr.index, y=c_tr.values, palette='magma', ax=ax2)
-            st.pyplot(fig2)
-            st.caption(f"""
-            **Grafik Analizi:** Farklı taahhüt sürelerinin müşteri tutma başarısını ölçer. 
-            Genellikle **{en_riskli_sozlesme}** tipi sözleşmelerde terk oranı çok daha yüksektir. 
-            Bu durum, müşterinin finansal bir bağlayıcılığı olmadığında rakip tekliflere daha hızlı yöneldiğini kanıtlar.
-            """)
+        m4.metric("Kayıp Müşteri Sayısı", f"{analytics.churn_count:,}")
+
+        # Günlük partilerle güncellenen birleştirilebilir özetler (python -m churnguard.sketches update)
+        birikimli = load_stats()
+        if birikimli is not None:
+            with st.expander(f"📈 Birikimli Portföy KPI'ları ({birikimli.n:,} müşteri)"):
+                kpi = birikimli.kpis()
+                b1, b2, b3, b4 = st.columns(4)
+                b1.metric("Genel Terk Oranı", f"%{kpi['genel_churn_orani']:.1f}")
+                b2.metric("Kritik Eşik (tahmini)", f"{kpi['kritik_esik']:.2f} $")
+                b3.metric("Medyan Abonelik", f"{kpi['tenure_med']:.1f} ay")
+                b4.metric("Medyan Aylık Ücret", f"{kpi['charge_med']:.2f} $")
+                st.dataframe(kpi['contract_churn'].rename("Terk Oranı (%)").round(1), width='stretch')
+
+        if tab2.open:
+            st.divider()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.subheader("🎯 Müşteri Değer Matrisi")
+                seg_c = analytics.segment_counts
+                cached_chart('segments', lambda plt, sns: draw_segments(plt, sns, seg_c))
+                st.caption("""
+                **Grafik Analizi:** Müşterileri 'Aylık Ücret' ve 'Bağlılık Süresi'ne göre 4 ana segmente ayırır. 
+                * **VIP:** Yüksek gelirli ve sadık kitle. 
+                * **Riskli Yeni:** Yüksek fatura ödeyen ancak henüz şirkete alışmamış, terk ihtimali en yüksek öncelikli grup. 
+                * **Sadık Eko:** Düşük ücretli ama uzun süreli bağlı kitle. 
+                * **Kayıp Adayı:** Hem düşük ücretli hem de yeni olan istikrarsız grup.
+                """)
 
-        st.divider()
-        col3, col4 = st.columns(2)
-        with col3:
-            st.subheader("🔗 Ek Hizmet Sahipliği Gücü")
-            h_list = ['OnlineSecurity', 'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies', 'OnlineBackup']
-            mevcut_h = [c for c in h_list if c in df.columns]
-            temp_h = df.copy()
-            # Kullanılan ek servis sayısını hesaplar
-            temp_h['H_Sayisi'] = temp_h[mevcut_h].apply(lambda x: x.map({'Yes': 1, 'No': 0, 'No internet service': 0}).sum(), axis=1)
-            h_anlz = temp_h.groupby('H_Sayisi')['Churn'].apply(lambda x: (x == 'Yes').mean() * 100)
-            fig3, ax3 = plt.subplots(figsize=(10, 5))
-            sns.lineplot(x=h_anlz.index, y=h_anlz.values, marker='o', color='green', ax=ax3)
-            st.pyplot(fig3)
-            st.caption("""
-            **Grafik Analizi:** 'Ürün Yapışkanlığı' (Product Stickiness) oranını gösterir. 
-            Müşterinin kullandığı ek hizmet sayısı (Güvenlik, Destek vb.) arttıkça terk oranının nasıl düştüğünü izler. 
-            3 ve üzeri hizmet kullanan müşterilerin şirketten ayrılma motivasyonu teknik ve operasyonel karmaşıklık nedeniyle azalır.
-            """)
+            with col2:
+                st.subheader("📜 Sözleşme Tipi vs Terk Oranı")
+                c_tr = contract_churn.rename(index={"Month-to-month": "Aylık", "One year": "1 Yıllık", "Two year": "2 Yıllık"})
+                cached_chart('contracts', lambda plt, sns: draw_contracts(plt, sns, c_tr))
+                st.caption(f"""
+                **Grafik Analizi:** Farklı taahhüt sürelerinin müşteri tutma başarısını ölçer. 
+                Genellikle **{en_riskli_sozlesme}** tipi sözleşmelerde terk oranı çok daha yüksektir. 
+                Bu durum, müşterinin finansal bir bağlayıcılığı olmadığında rakip tekliflere daha hızlı yöneldiğini kanıtlar.
+                """)
 
-        with col4:
-            st.subheader("💳 Ödeme Yöntemi Bazlı Kayıplar")
-            if 'PaymentMethod' in df.columns:
-                pay_tr = {"Electronic check": "E-Çek", "Mailed check": "Posta", "Bank transfer (automatic)": "Banka", "Credit card (automatic)": "K.Kartı"}
-                pay_data = df[df['Churn'] == 'Yes']['PaymentMethod'].value_counts().reset_index()
-                pay_data['PaymentMethod'] = pay_data['PaymentMethod'].map(pay_tr).fillna(pay_data['PaymentMethod'])
-                fig4, ax4 = plt.subplots(figsize=(10, 5))
-                sns.barplot(data=pay_data, y='PaymentMethod', x='count', palette='flare', ax=ax4)
-                st.pyplot(fig4)
+            st.divider()
+            col3, col4 = st.columns(2)
+            with col3:
+                st.subheader("🔗 Ek Hizmet Sahipliği Gücü")
+                # Kullanılan ek servis sayısına göre terk oranı
+                h_anlz = analytics.service_churn
+                cached_chart('services', lambda plt, sns: draw_services(plt, sns, h_anlz))
                 st.caption("""
-                **Grafik Analizi:** Finansal operasyonların terk üzerindeki etkisidir. 
-                Otomatik ödeme (Kredi Kartı/Banka) dışındaki yöntemlerde, her ay manuel işlem yapılması müşteriye ayrılma kararını hatırlatır. 
-                Özellikle E-Çek gibi yöntemlerdeki yüksek kayıp, tahsilat sorunlarına veya işlem zorluğuna işaret eder.
+                **Grafik Analizi:** 'Ürün Yapışkanlığı' (Product Stickiness) oranını gösterir. 
+                Müşterinin kullandığı ek hizmet sayısı (Güvenlik, Destek vb.) arttıkça terk oranının nasıl düştüğünü izler. 
+                3 ve üzeri hizmet kullanan müşterilerin şirketten ayrılma motivasyonu teknik ve operasyonel karmaşıklık nedeniyle azalır.
                 """)
 
-        st.divider()
-        # Fiyat hassasiyeti yoğunluk haritası
-        st.subheader("⚖️ Fatura Yoğunluğu ve Karar Sınırı")
-        fig5, ax5 = plt.subplots(figsize=(20, 5))
-        sns.kdeplot(data=df[df['Churn']=='Yes']['MonthlyCharges'], label="Ayrılan", fill=True, color="red", ax=ax5)
-        sns.kdeplot(data=df[df['Churn']=='No']['MonthlyCharges'], label="Kalan", fill=True, color="green", ax=ax5)
-        ax5.axvline(kritik_esik, color='black', linestyle='--')
-        ax5.legend(); st.pyplot(fig5)
-        st.caption(f"""
-        **Grafik Analizi:** Fiyat hassasiyetinin yoğunluk haritasıdır. 
-        Kırmızı alanın (Ayrılanlar) yeşil alanı (Kalanlar) geçmeye başladığı **{kritik_esik:.2f} $** noktası, müşterinin ödediği ücretin karşılığını sorgulamaya başladığı 'Kritik Psikolojik Eşik'tir. 
-        Bu eşiğin üzerindeki müşteriler rakip tekliflere en duyarlı gruptur.
-        """)
+            with col4:
+                st.subheader("💳 Ödeme Yöntemi Bazlı Kayıplar")
+                if 'PaymentMethod' in df.columns:
+                    pay_data = analytics.payment_churn
+                    cached_chart('payments', lambda plt, sns: draw_payments(plt, sns, pay_data))
+                    st.caption("""
+                    **Grafik Analizi:** Finansal operasyonların terk üzerindeki etkisidir. 
+                    Otomatik ödeme (Kredi Kartı/Banka) dışındaki yöntemlerde, her ay manuel işlem yapılması müşteriye ayrılma kararını hatırlatır. 
+                    Özellikle E-Çek gibi yöntemlerdeki yüksek kayıp, tahsilat sorunlarına veya işlem zorluğuna işaret eder.
+                    """)
+
+            st.divider()
+            # Fiyat hassasiyeti yoğunluk haritası
+            st.subheader("⚖️ Fatura Yoğunluğu ve Karar Sınırı")
+            # Yoğunluklar ham değerler yerine veri seti başına bir kez hesaplanan kutu sayımlarından çizilir
+            cached_chart('density', lambda plt, sns: draw_density(plt, analytics.charge_density, kritik_esik))
+            st.caption(f"""
+            **Grafik Analizi:** Fiyat hassasiyetinin yoğunluk haritasıdır. 
+            Kırmızı alanın (Ayrılanlar) yeşil alanı (Kalanlar) geçmeye başladığı **{kritik_esik:.2f} $** noktası, müşterinin ödediği ücretin karşılığını sorgulamaya başladığı 'Kritik Psikolojik Eşik'tir. 
+            Bu eşiğin üzerindeki müşteriler rakip tekliflere en duyarlı gruptur.
+            """)
 
 # --- TAB 3: STRATEJİK YOL HARİTASI VE ROI ---
 with tab3:
     st.title("🚀 Aksiyon ve Strateji Merkezi")
-    if not df.empty:
+    if not veri_yok:
         # Finansal kayıp ve kurtarma potansiyeli hesaplamaları
-        risk_gelir = df[df['Churn']=='Yes']['MonthlyCharges'].sum()
+        risk_gelir = analytics.risk_gelir
         kurtarma_orani = 0.25 # %25 başarı hedefi
         aylik_kazanc = risk_gelir * kurtarma_orani
         
-        tenure_med = df['tenure'].median()
-        charge_med = df['MonthlyCharges'].median()
-        def quick_seg(row):
-            if row['MonthlyCharges'] >= charge_med and row['tenure'] >= tenure_med: return 'VIP'
-            if row['MonthlyCharges'] >= charge_med and row['tenure'] < tenure_med: return 'Riskli Yeni'
-            return 'Diğer'
-        
-        temp_strat = df.copy()
-        temp_strat['Segment'] = temp_strat.apply(quick_seg, axis=1)
-        segment_risk_dağılımı = temp_strat[temp_strat['Churn']=='Yes']['Segment'].value_counts(normalize=True) * 100
+        segment_risk_dağılımı = analytics.segment_risk_dagilimi
 
         # Stratejik Finansal Hedef Metrikleri
         st.subheader("💰 Stratejik Finansal Hedefler")
@@ -442,7 +443,7 @@ with tab3:
                  st.write(f"**Durum:** Bu gruptaki terk oranı %{risk_orani_sozlesme:.1f}. Acil 12 aylık taahhüt kampanyası başlatılmalı.")
                  st.progress(int(risk_orani_sozlesme))
             
-            high_ticket_churn = (df[df['MonthlyCharges'] > kritik_esik]['Churn'] == 'Yes').mean() * 100
+            high_ticket_churn = analytics.high_ticket_churn
             with st.expander(f"📌 {kritik_esik:.2f}$ Üzeri Fatura Koruması"):
                 st.write(f"**Durum:** Eşik üzerindeki müşterilerde kayıp oranı %{high_ticket_churn:.1f}. Sadakat indirimi tanımlanmalı.")
                 st.progress(int(high_ticket_churn))
@@ -460,6 +461,43 @@ with tab3:
 
         st.divider()
 
+        # Bütçe kısıtlı teklif optimizasyonu: her müşteri her teklif altında bir kez skorlanır
+        # (veri seti başına önbellekte), bütçe/ufuk değişince yalnızca vektörel çözücü çalışır.
+        # Portföy skorlaması pahalı olduğundan yalnızca bu sekme açıkken yapılır.
+        st.subheader("🎯 Bütçe Kısıtlı Teklif Optimizasyonu")
+        if akisli:
+            st.info(portfoy_bellek_notu)
+        elif scenario_engine is not None and tab3.open:
+            offer_scores = profiler.timed('Teklif Skorlama', load_offer_scores, analytics.fingerprint, aktif_model, df)
+            o1, o2 = st.columns(2)
+            ufuk = o1.slider("Değerlendirme Ufku (Ay)", 1, 36, 12)
+            max_butce = float((offer_scores.charges * ufuk).sum() * max(o.discount for o in offer_scores.offers))
+            butce = o2.slider("Toplam İndirim Bütçesi ($)", 0.0, max(max_butce, 1.0), min(max_butce, 50_000.0), step=max(max_butce / 200, 1.0))
+            plan = optimize_offers(offer_scores, butce, horizon=ufuk)
+
+            p1, p2, p3 = st.columns(3)
+            p1.metric("Teklif Atanan Müşteri", f"{int((plan.offer >= 0).sum()):,}")
+            p2.metric("Kullanılan Bütçe", f"{plan.spent:,.0f} $")
+            p3.metric("Beklenen Kurtarılan Gelir", f"{plan.expected_saved:,.0f} $")
+            st.dataframe(plan_summary(offer_scores, plan).style.format({'İndirim Maliyeti ($)': '{:,.0f}', 'Beklenen Kurtarılan Gelir ($)': '{:,.0f}'}),
+                         width='stretch')
+
+            with st.expander("📋 Müşteri Bazlı Teklif Planı (En Yüksek Kazanç İlk 100)"):
+                secili = np.flatnonzero(plan.offer >= 0)
+                secili = secili[np.argsort(-plan.gain[secili], kind='stable')[:100]]
+                teklif_adlari = np.array([o.name for o in offer_scores.offers])
+                st.dataframe(pd.DataFrame({
+                    'Müşteri Kimliği': df['customerID'].to_numpy()[secili] if 'customerID' in df.columns else secili,
+                    'Teklif': teklif_adlari[plan.offer[secili]],
+                    'Mevcut Risk': offer_scores.base_risk[secili],
+                    'Teklif Sonrası Risk': offer_scores.offer_risk[secili, plan.offer[secili]],
+                    'Beklenen Kazanç ($)': plan.gain[secili],
+                    'Maliyet ($)': plan.cost[secili],
+                }).style.format({'Mevcut Risk': '{:.1%}', 'Teklif Sonrası Risk': '{:.1%}', 'Beklenen Kazanç ($)': '{:,.2f}', 'Maliyet ($)': '{:,.2f}'}),
+                    width='stretch')
+
+        st.divider()
+
         # Aksiyon Öncelik Matrisi Tablosu
         st.subheader("📊 Aksiyon Önceliklendirme Matrisi")
         
@@ -473,29 +511,133 @@ with tab3:
         
         st.info("💡 **Stratejik Not:** 'Yüksek Etki' ve 'Kolay Uygulama' olan aksiyonlar (Low-Hanging Fruit) ilk çeyrek hedeflerine alınmalıdır.")
 
+        st.divider()
+
+        # Senaryo ızgarasının tüm portföye uygulanması (tek matris, parçalı model çağrıları)
+        st.subheader("🌐 Portföy Senaryo Analizi")
+        if scenario_engine is None:
+            st.error(model_hatasi)
+        elif akisli:
+            st.info(portfoy_bellek_notu)
+        elif st.button("Senaryo Izgarasını Tüm Portföyde Çalıştır"):
+            with st.spinner('Senaryolar skorlanıyor...'):
+                portfoy_yuzeyi = scenario_engine.portfolio_surface(df, scenario_grid())
+            st.dataframe(portfoy_yuzeyi.sort_values('Ortalama Risk').style.format({'Ortalama Risk': '{:.1%}', 'Riskli Müşteri': '{:,}'}),
+                         width='stretch')
+
 # --- TAB 4: OPERASYONEL LİSTE VE TOPLU TARAMA ---
 with tab4:
         st.divider()
         st.subheader("📋 Toplu Müşteri Risk Taraması")
-        if st.button("Tüm Portföyü Tara ve Risk Raporu Oluştur"):
-            with st.spinner('Analiz ediliyor...'):
-                # Tüm veri seti için risk skorlarını hesaplar
-                risk_scores = run_batch_prediction(df, model, features)
-                df['Risk_Skoru'] = risk_scores
-                
-                # Riskli müşterileri süzerek listeler
-                riskli_liste = df[df['Risk_Skoru'] > 0.5].sort_values(by='Risk_Skoru', ascending=False)
-                display_cols = ['customerID', 'tenure', 'Contract', 'InternetService', 'TechSupport', 'PaymentMethod', 'MonthlyCharges', 'Risk_Skoru']
-                report_df = riskli_liste[display_cols].copy().rename(columns=column_mapping)
-                
-                st.success(f"Analiz Tamamlandı! {len(riskli_liste)} yüksek riskli müşteri saptandı.")
-                # Renklendirilmiş interaktif tablo
+        scan_job = None
+        if model is None:
+            # Tarama ParallelScorer/IncrementalScorer için model dosyasına ihtiyaç duyar
+            st.error(model_hatasi)
+        else:
+            n_jobs = st.number_input("Paralel İşçi Sayısı (Çekirdek)", min_value=1, value=N_JOBS,
+                                     help="Büyük portföyler süreç havuzunda parçalara bölünerek skorlanır. 1 = tek çekirdek.")
+            artimli = st.checkbox("♻️ Artımlı Tarama (yalnızca yeni/değişen müşterileri skorla)", value='customerID' in df.columns,
+                                  disabled='customerID' not in df.columns,
+                                  help="Skorlar customerID bazında kalıcı depoda tutulur; değişmeyen müşteriler yeniden skorlanmaz.")
+            if st.button("Tüm Portföyü Tara ve Risk Raporu Oluştur"):
+                # Yüklenen dosya (yoksa varsayılan veri seti) arka planda parça parça okunup skorlanır;
+                # bellekte yalnızca yüksek riskli müşteriler tutulur. Yükleme nesnesi yeniden
+                # çalıştırmalarda değişebileceğinden işe içeriğin bir kopyası verilir.
+                scan_source = io.BytesIO(uploaded_file.getvalue()) if uploaded_file is not None else DEFAULT_DATA_PATH
+                scorer = ParallelScorer(model_entry.model_path, n_jobs=int(n_jobs), model=model)
+                incremental = IncrementalScorer(load_score_store(), encoder, scorer, model_version(model_entry.model_path)) if artimli else None
+
+                # Oturumun önceki, bitmemiş taraması yenisiyle değiştirilir
+                onceki = st.session_state.get('scan_job')
+                if onceki is not None and not onceki.done:
+                    onceki.cancel()
+
+                # Parça boyutu işçi sayısıyla ölçeklenir ki her işçiye anlamlı bir iş düşsün
+                # Eşik sonradan arayüzde değiştirilebilsin diye KEEP_THRESHOLD üstündeki herkes tutulur
+                st.session_state['scan_job'] = load_job_manager().submit(
+                    "Portföy taraması", scan_risk_report, meta={'incremental': incremental},
+                    source=scan_source, encoder=encoder, score_fn=scorer, threshold=KEEP_THRESHOLD,
+                    segment_medians=(analytics.tenure_med, analytics.charge_med), explainer=assets.explainer,
+                    chunksize=DEFAULT_CHUNKSIZE * int(n_jobs), score_chunk=incremental)
+
+            # İş nesnesi oturumda tutulur: sonuç, diğer oturumların işleri yöneticiden çıkarılsa da korunur
+            scan_job = st.session_state.get('scan_job')
+            if scan_job is not None and not scan_job.done:
+                scan_job_status()
+            elif scan_job is not None and scan_job.status == CANCELLED:
+                st.warning(f"Tarama iptal edildi ({scan_job.progress.rows:,} müşteri tarandıktan sonra).")
+            elif scan_job is not None and scan_job.status == FAILED:
+                st.error(f"Tarama başarısız oldu: {scan_job.error}")
+            elif scan_job is not None:
+                # Bitmiş işin sonucu oturum durumunda saklıdır; filtre/widget değişikliklerinde yeniden skorlanmaz
+                risk_raporu = scan_job.result
+                incremental = scan_job.meta.get('incremental')
+                if incremental is not None:
+                    st.caption(f"♻️ {incremental.stats.rescored:,} müşteri yeniden skorlandı, {incremental.stats.reused:,} skor depodan kullanıldı.")
+
+                # Eşik ve filtreler sıralı indeks üzerinde sorgulanır; tarama tekrarlanmaz
+                f_cols = st.columns([2, 2, 2, 2])
+                esik = f_cols[0].slider("Risk Eşiği", min_value=KEEP_THRESHOLD, max_value=1.0, value=0.5, step=0.01)
+                filtreler = {
+                    col: f_cols[i].multiselect(column_mapping[col], risk_raporu.options(col))
+                    for i, col in enumerate(['Segment', 'Contract', 'InternetService'], start=1)
+                    if col in risk_raporu.filters
+                }
+                toplam = profiler.timed('Rapor Sıralama/Filtre', risk_raporu.count, esik, filtreler)
+                st.success(f"Analiz Tamamlandı! {toplam} yüksek riskli müşteri saptandı. "
+                           f"({scan_job.progress.rows:,} müşteri, {scan_job.elapsed:.1f} sn)")
+
+                sayfa = st.number_input(f"Sayfa (toplam {risk_raporu.n_pages(esik, filtreler)})", min_value=1,
+                                        max_value=risk_raporu.n_pages(esik, filtreler), value=1)
+                display_cols = ['customerID', 'Segment', 'tenure', 'Contract', 'InternetService', 'TechSupport', 'PaymentMethod', 'MonthlyCharges', 'Risk_Skoru', 'Risk_Etkenleri']
+                sayfa_df = profiler.timed('Rapor Sayfası', risk_raporu.page, esik, filtreler, int(sayfa) - 1)
+                report_df = sayfa_df[[c for c in display_cols if c in sayfa_df.columns]].rename(columns=column_mapping)
+
+                # Renklendirilmiş tablo: yalnızca görünen sayfa biçimlendirilip istemciye gönderilir
                 st.dataframe(
-                report_df.style.background_gradient(subset=['Terk Riski (%)'], cmap='Reds')
+                report_df.style.background_gradient(subset=['Terk Riski (%)'], cmap='Reds', vmin=0, vmax=1)
                 .format({'Terk Riski (%)': '{:.1%}', 'Aylık Ücret ($)': '{:.2f} $'}),
-                use_container_width=True
+                width='stretch', hide_index=True
                 )
-                
-                # Rapor indirme butonu
-                csv = riskli_liste.to_csv(index=False).encode('utf-8')
-                st.download_button("📥 Kritik Risk Raporunu İndir (CSV)", csv, "risk_raporu.csv", "text/csv")
\ No newline at end of file
+            
+                # Rapor indirme (seçili eşik ve filtrelerle): dosya yalnızca tıklanınca parça parça
+                # geçici dosyaya yazılır; Streamlit indirmeyi sunmak için bitmiş dosyanın baytlarını
+                # bellekte tutar (gzip/Parquet bu boyutu küçültür)
+                e_cols = st.columns([2, 2, 1])
+                top_k = e_cols[1].number_input("En Riskli K Müşteri (0 = tümü)", min_value=0, value=0, step=1000)
+                # Excel sayfa sınırı indirme başlamadan denetlenir; aşan raporda XLSX seçeneği kaldırılır
+                rapor_satir = min(toplam, int(top_k)) if top_k else toplam
+                bicimler = available_formats(rapor_satir)
+                if len(bicimler) < len(available_formats()):
+                    st.warning(f"Rapor {rapor_satir:,} satır ve Excel sayfa sınırını aşıyor; XLSX yerine CSV veya Parquet kullanın.")
+                bicim = e_cols[0].selectbox("Dışa Aktarım Biçimi", bicimler, format_func=str.upper)
+                sikistir = e_cols[2].checkbox("gzip", disabled=bicim == 'xlsx')
+                rapor_parcalari = lambda: export_bytes(risk_raporu.iter_view(esik, filtreler, limit=int(top_k) or None), bicim, sikistir)
+                st.download_button(f"📥 Kritik Risk Raporunu İndir ({bicim.upper()})", rapor_parcalari,
+                                   export_filename("risk_raporu", bicim, sikistir), export_mime(bicim, sikistir))
+
+        # Müşteri bazlı skor geçmişi (artımlı tarama deposundan)
+        with st.expander("🕒 Müşteri Skor Geçmişi"):
+            aranan_id = st.text_input("Müşteri Kimliği")
+            if aranan_id:
+                gecmis = load_score_store().history(aranan_id.strip())
+                if gecmis.empty:
+                    st.info("Bu müşteri için kayıtlı skor bulunamadı.")
+                else:
+                    st.line_chart(gecmis.set_index('scored_at')['score'])
+                    st.dataframe(gecmis, width='stretch')
+
+# --- PERFORMANS PROFİLİ PANELİ ---
+# Yavaş bir yeniden çalıştırmada hangi aşamanın zaman harcadığını üretimde görmek için
+st.sidebar.markdown("---")
+st.sidebar.toggle("⏱️ Performans Profili", key="profil_paneli",
+                  help="Her yeniden çalıştırmada veri okuma, KPI, tahmin, grafik ve rapor aşamalarının sürelerini gösterir.")
+if profiler.enabled:
+    with st.sidebar.expander("Aşama Süreleri (son çalıştırma)", expanded=True):
+        st.dataframe(profiler.frame().style.format({'Süre (ms)': '{:.1f}', 'Pay (%)': '{:.0f}'}),
+                     width='stretch', hide_index=True)
+        en_yavas = profiler.slowest()
+        st.caption(f"Betik toplamı {profiler.elapsed * 1000:.0f} ms, ölçülen aşamalar {profiler.total * 1000:.0f} ms"
+                   + (f"; en yavaş: {en_yavas.name}" if en_yavas else ""))
+        if scan_job is not None and scan_job.done:
+            st.caption(f"Son portföy taraması (arka plan): {scan_job.elapsed:.1f} sn")
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""ChurnGuard AI çekirdek modülleri (Streamlit arayüzünden bağımsız)."""
+
+from churnguard.encoding import FeatureEncoder, get_encoder
+from churnguard.scoring import predict_risk
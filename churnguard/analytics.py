@@ -0,0 +1,321 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from churnguard.charts import (ChargeDensity, charge_density, density_edges, kde_from_counts,
+                               scott_bandwidth_from_moments)
+from churnguard.ingestion import check_data_quality, iter_telco_chunks
+from churnguard.segmentation import SEGMENTS, SERVICE_COLUMNS, Segmentation, compute_segmentation, count_services, \
+    segment_customers
+from churnguard.sketches import TDigest
+from churnguard.streaming import DEFAULT_CHUNKSIZE
+
+# Veri seti gelmezse hata almamak için fallback değerleri
+FALLBACK_KRITIK_ESIK = 79.65
+FALLBACK_CHURN_ORANI = 26.5
+FALLBACK_CONTRACT_CHURN = {'Month-to-month': 42.7, 'One year': 11.2, 'Two year': 2.8}
+
+PAYMENT_TR = {"Electronic check": "E-Çek", "Mailed check": "Posta", "Bank transfer (automatic)": "Banka", "Credit card (automatic)": "K.Kartı"}
+
+# Akışlı analizde ikinci geçişte okunan sütunlar
+STREAM_COLUMNS = ['tenure', 'MonthlyCharges', 'Churn'] + SERVICE_COLUMNS
+
+
+@dataclass
+class DatasetAnalytics:
+    """Bir veri seti için bir kez hesaplanan KPI'lar, segment tabloları ve grafik verileri.
+
+    Akışlı hesaplamada (`compute_analytics_stream`) satır bazlı `segmentation` None'dır.
+    """
+    fingerprint: str
+    n_customers: int
+    churn_count: int
+    kritik_esik: float
+    genel_churn_orani: float
+    contract_churn: pd.Series
+    en_riskli_sozlesme: str
+    tenure_med: float
+    charge_med: float
+    clv_referans: float
+    risk_gelir: float
+    high_ticket_churn: float
+    segmentation: Segmentation
+    segment_counts: pd.DataFrame
+    segment_risk_dagilimi: pd.Series
+    service_churn: pd.Series
+    payment_churn: pd.DataFrame
+    charge_density: ChargeDensity
+
+
+def dataset_fingerprint(df):
+    """Veri setinin içerik özetini (şema + tüm hücreler) döndürür.
+
+    Dosya özetiyle yüklenen veri setlerinde (bkz. ingestion) hazır özet kullanılır.
+    """
+    if 'fingerprint' in df.attrs:
+        return df.attrs['fingerprint']
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def compute_analytics(df, fingerprint=None):
+    """Tüm üst düzey analitikleri tek geçişte hesaplar."""
+    fingerprint = fingerprint or dataset_fingerprint(df)
+    is_churn = (df['Churn'] == 'Yes').to_numpy() if 'Churn' in df.columns else np.zeros(len(df), dtype=bool)
+    charges = df['MonthlyCharges'] if 'MonthlyCharges' in df.columns else None
+
+    # Veri üzerinden kritik eşik ve terk oranlarını hesaplar
+    if charges is not None and 'Churn' in df.columns:
+        kritik_esik = charges[is_churn].median()
+        genel_churn_orani = is_churn.mean() * 100
+        contract_churn = pd.Series(is_churn, index=df.index).groupby(df['Contract'], observed=True).mean() * 100
+        en_riskli_sozlesme = contract_churn.idxmax() if not contract_churn.empty else "Bilinmiyor"
+    else:
+        kritik_esik = FALLBACK_KRITIK_ESIK
+        genel_churn_orani = FALLBACK_CHURN_ORANI
+        contract_churn = pd.Series(FALLBACK_CONTRACT_CHURN)
+        en_riskli_sozlesme = "Aylık"
+
+    # Segmentler ve ek servis sayıları sütun bazlı (vektörel) tek geçişte hesaplanır
+    seg = compute_segmentation(df)
+    segment = pd.Series(seg.segment, name='Segment')
+    segment_counts = segment.value_counts().reset_index()
+    segment_counts = segment_counts[segment_counts['count'] > 0].reset_index(drop=True)
+    segment_risk_dagilimi = segment[is_churn].value_counts(normalize=True) * 100
+
+    # Kullanılan ek servis sayısına göre terk oranı
+    service_churn = pd.Series(is_churn).groupby(seg.service_count).mean() * 100
+
+    if 'PaymentMethod' in df.columns:
+        payment_churn = _payment_table(df.loc[is_churn, 'PaymentMethod'].astype(str).value_counts())
+    else:
+        payment_churn = pd.DataFrame(columns=['PaymentMethod', 'count'])
+
+    high_ticket = charges > kritik_esik
+    return DatasetAnalytics(
+        fingerprint=fingerprint,
+        n_customers=len(df),
+        churn_count=int(is_churn.sum()),
+        kritik_esik=kritik_esik,
+        genel_churn_orani=genel_churn_orani,
+        contract_churn=contract_churn,
+        en_riskli_sozlesme=en_riskli_sozlesme,
+        tenure_med=seg.tenure_med,
+        charge_med=seg.charge_med,
+        clv_referans=charges.mean() * df['tenure'].mean(),
+        risk_gelir=charges[is_churn].sum(),
+        high_ticket_churn=is_churn[high_ticket.to_numpy()].mean() * 100,
+        segmentation=seg,
+        segment_counts=segment_counts,
+        segment_risk_dagilimi=segment_risk_dagilimi,
+        service_churn=service_churn,
+        payment_churn=payment_churn,
+        charge_density=charge_density(charges.to_numpy(), is_churn),
+    )
+
+
+def _payment_table(counts):
+    payment_churn = counts.sort_values(ascending=False, kind='stable').rename_axis('PaymentMethod').rename('count').reset_index()
+    payment_churn['PaymentMethod'] = payment_churn['PaymentMethod'].map(PAYMENT_TR).fillna(payment_churn['PaymentMethod'])
+    return payment_churn
+
+
+class _Moments:
+    """Parça parça birleştirilen sayı / ortalama / kare sapma toplamı (Chan yöntemi)."""
+
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+
+def compute_analytics_stream(source, fingerprint, chunksize=DEFAULT_CHUNKSIZE):
+    """Veri setini belleğe almadan iki parçalı geçişte analiz eder: (analitikler, kalite sorunları).
+
+    İlk geçiş tüm sütunları okuyup kalite kontrolünü, oranları, nicelik özetlerini
+    (t-digest) ve ücret momentlerini biriktirir; ikinci geçiş medyanlara ve kritik
+    eşiğe bağlı segment, servis ve yoğunluk sayımlarını yapar. Medyanlar ve kritik
+    eşik tahminidir; bellek kullanımı parça boyutuyla sınırlıdır.
+    """
+    n = churn_n = 0
+    charge_sum = tenure_sum = churn_charge_sum = 0.0
+    charge_valid = tenure_valid = 0
+    has_churn = has_contract = has_payment = True
+    contract, payment = {}, {}
+    tenure_q, charge_q, churn_charge_q = TDigest(), TDigest(), TDigest()
+    churn_moments, retained_moments = _Moments(), _Moments()
+    lo, hi = np.inf, -np.inf
+    for chunk in iter_telco_chunks(source, chunksize):
+        # Uygulamada her kalite sorunu veri setini reddettiğinden ilk sorunlu parçada durulur
+        issues = check_data_quality(chunk)
+        if issues:
+            return None, issues
+        has_churn, has_contract, has_payment = ('Churn' in chunk.columns, 'Contract' in chunk.columns,
+                                                'PaymentMethod' in chunk.columns)
+        is_churn = (chunk['Churn'] == 'Yes').to_numpy() if has_churn else np.zeros(len(chunk), dtype=bool)
+        charges = chunk['MonthlyCharges'].to_numpy(dtype=np.float64)
+        tenure = chunk['tenure'].to_numpy(dtype=np.float64)
+        n += len(chunk)
+        churn_n += int(is_churn.sum())
+        charge_sum += float(np.nansum(charges))
+        charge_valid += int((~np.isnan(charges)).sum())
+        tenure_sum += float(np.nansum(tenure))
+        tenure_valid += int((~np.isnan(tenure)).sum())
+        churn_charge_sum += float(np.nansum(charges[is_churn]))
+        if has_contract:
+            _add_counts(contract, pd.Series(is_churn).groupby(chunk['Contract'].to_numpy(), observed=True).agg(['size', 'sum']))
+        if has_payment:
+            _add_counts(payment, chunk.loc[is_churn, 'PaymentMethod'].astype(str).value_counts().to_frame('size'))
+        tenure_q.update(tenure)
+        charge_q.update(charges)
+        churn_charge_q.update(charges[is_churn])
+        churn_moments.update(charges[is_churn])
+        retained_moments.update(charges[~is_churn])
+        if (~np.isnan(charges)).any():
+            lo, hi = min(lo, float(np.nanmin(charges))), max(hi, float(np.nanmax(charges)))
+
+    if has_churn:
+        kritik_esik = churn_charge_q.median()
+        genel_churn_orani = churn_n / n * 100
+        contract_churn = pd.Series({c: v[1] / v[0] * 100 for c, v in contract.items() if v[0]}, dtype=float)
+        en_riskli_sozlesme = contract_churn.idxmax() if not contract_churn.empty else "Bilinmiyor"
+    else:
+        kritik_esik = FALLBACK_KRITIK_ESIK
+        genel_churn_orani = FALLBACK_CHURN_ORANI
+        contract_churn = pd.Series(FALLBACK_CONTRACT_CHURN)
+        en_riskli_sozlesme = "Aylık"
+    tenure_med, charge_med = tenure_q.median(), charge_q.median()
+
+    bw_churn = scott_bandwidth_from_moments(churn_moments.n, churn_moments.variance)
+    bw_retained = scott_bandwidth_from_moments(retained_moments.n, retained_moments.variance)
+    edges = density_edges(lo, hi, bw_churn, bw_retained) if lo <= hi else None
+    segment_n = np.zeros(len(SEGMENTS), dtype=np.int64)
+    segment_churn = np.zeros(len(SEGMENTS), dtype=np.int64)
+    service_n = np.zeros(len(SERVICE_COLUMNS) + 1, dtype=np.int64)
+    service_churn_n = np.zeros(len(SERVICE_COLUMNS) + 1, dtype=np.int64)
+    high_n = high_churn = 0
+    hist_churn = hist_retained = np.zeros(len(edges) - 1 if edges is not None else 0, dtype=np.int64)
+    for chunk in iter_telco_chunks(source, chunksize, usecols=STREAM_COLUMNS):
+        is_churn = (chunk['Churn'] == 'Yes').to_numpy() if 'Churn' in chunk.columns else np.zeros(len(chunk), dtype=bool)
+        charges = chunk['MonthlyCharges'].to_numpy(dtype=np.float64)
+        codes = segment_customers(chunk['tenure'], charges, tenure_med, charge_med).codes
+        segment_n += np.bincount(codes, minlength=len(SEGMENTS))
+        segment_churn += np.bincount(codes[is_churn], minlength=len(SEGMENTS))
+        services = count_services(chunk)
+        service_n += np.bincount(services, minlength=len(service_n))
+        service_churn_n += np.bincount(services[is_churn], minlength=len(service_n))
+        high = charges > kritik_esik
+        high_n += int(high.sum())
+        high_churn += int((high & is_churn).sum())
+        if edges is not None:
+            hist_churn = hist_churn + np.histogram(charges[is_churn], bins=edges)[0]
+            hist_retained = hist_retained + np.histogram(charges[~is_churn], bins=edges)[0]
+
+    segment_counts = pd.DataFrame({'Segment': SEGMENTS, 'count': segment_n})
+    segment_counts = segment_counts[segment_counts['count'] > 0].sort_values('count', ascending=False, kind='stable')
+    segment_risk_dagilimi = pd.Series(segment_churn / max(churn_n, 1) * 100, index=pd.CategoricalIndex(SEGMENTS, name='Segment'),
+                                      name='proportion').sort_values(ascending=False, kind='stable')
+    seen = service_n > 0
+    service_churn = pd.Series(service_churn_n[seen] / service_n[seen] * 100, index=np.flatnonzero(seen))
+    if edges is not None:
+        density = ChargeDensity((edges[:-1] + edges[1:]) / 2, kde_from_counts(hist_churn, edges, bw_churn),
+                                kde_from_counts(hist_retained, edges, bw_retained))
+    else:
+        density = ChargeDensity(np.empty(0), np.empty(0), np.empty(0))
+    payment_churn = (_payment_table(pd.Series({k: v[0] for k, v in payment.items()}, dtype=np.int64))
+                     if has_payment else pd.DataFrame(columns=['PaymentMethod', 'count']))
+
+    analytics = DatasetAnalytics(
+        fingerprint=fingerprint,
+        n_customers=n,
+        churn_count=churn_n,
+        kritik_esik=kritik_esik,
+        genel_churn_orani=genel_churn_orani,
+        contract_churn=contract_churn,
+        en_riskli_sozlesme=en_riskli_sozlesme,
+        tenure_med=tenure_med,
+        charge_med=charge_med,
+        clv_referans=(charge_sum / charge_valid) * (tenure_sum / tenure_valid) if charge_valid and tenure_valid else float('nan'),
+        risk_gelir=churn_charge_sum,
+        high_ticket_churn=high_churn / high_n * 100 if high_n else float('nan'),
+        segmentation=None,
+        segment_counts=segment_counts.reset_index(drop=True),
+        segment_risk_dagilimi=segment_risk_dagilimi,
+        service_churn=service_churn,
+        payment_churn=payment_churn,
+        charge_density=density,
+    )
+    return analytics, issues
+
+
+def _add_counts(totals, grouped):
+    for key, row in grouped.iterrows():
+        counts = totals.setdefault(key, [0, 0])
+        for i, value in enumerate(row.to_numpy()[:2]):
+            counts[i] += int(value)
+
+
+class AnalyticsCache:
+    """Parmak izine göre anahtarlanan, sınırlı boyutlu (LRU) analitik önbelleği."""
+
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, fingerprint=None):
+        fingerprint = fingerprint or dataset_fingerprint(df)
+        return self.get_or_compute(fingerprint, lambda: compute_analytics(df, fingerprint))
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Süreç genelinde paylaşılan önbellek (tüm oturumlar aynı veri seti için aynı sonucu kullanır)
+_CACHE = AnalyticsCache()
+
+
+def get_analytics(df, fingerprint=None):
+    """Veri setinin analitiklerini önbellekten döndürür; yoksa hesaplayıp saklar."""
+    return _CACHE.get(df, fingerprint)
+
+
+def get_analytics_stream(source, fingerprint, chunksize=DEFAULT_CHUNKSIZE):
+    """Büyük veri setinin akışlı analitiklerini ve kalite sorunlarını önbellekten döndürür."""
+    return _CACHE.get_or_compute(f'{fingerprint}:stream', lambda: compute_analytics_stream(source, fingerprint, chunksize))
@@ -0,0 +1,169 @@
+"""Sentetik veriyle uçtan uca boru hattı benchmark'ı ve gerileme eşikleri.
+
+Her veri boyutu için uygulamanın aşamaları ayrı ayrı ölçülür: okuma, veri kalitesi,
+KPI + segmentasyon, kodlama, toplu tahmin, rapor sıralama/filtreleme ve dışa aktarım.
+Her aşama yalnızca kendi işini yapar: segmentasyon KPI analitiğinden, toplu tahmin
+kodlama aşamasının matrisinden alınır (iş iki kez ölçülmez).
+Süreler bellek izlemesi kapalıyken, tepe bellek ayrı bir geçişte tracemalloc ile
+ölçülür. Aşama 1M satır başına bütçeyi veya önceki bir çalıştırmayı (`--baseline`)
+belirgin biçimde aşarsa çıkış kodu 1 olur.
+
+Kullanım:
+    python -m churnguard.benchmark --rows 100000 1000000 [--save bench.json] [--baseline bench.json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from churnguard.analytics import compute_analytics
+from churnguard.config import FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import get_encoder
+from churnguard.export import write_report
+from churnguard.ingestion import check_data_quality, read_telco_csv
+from churnguard.profiling import StageProfiler
+from churnguard.report import KEEP_THRESHOLD, RiskReport
+from churnguard.scoring import predict_risk
+from churnguard.segmentation import segment_customers
+from churnguard.startup import load_features, load_model
+from churnguard.streaming import REPORT_COLUMNS
+from churnguard.synthetic import write_synthetic
+
+# Aşama başına 1M satır için üst sınırlar: (saniye, tepe bellek MB). Tek çekirdekli
+# referans makinedeki ölçümlerin yaklaşık 2-3 katıdır; daha yavaş makinelerde `--budget-scale` ile ölçeklenir.
+STAGE_BUDGETS = {
+    'Veri Okuma': (9.0, 650),
+    'Veri Kalitesi': (0.1, 60),
+    'KPI + Segmentasyon': (1.3, 100),
+    'Kodlama': (1.5, 700),
+    'Toplu Tahmin': (25.0, 100),
+    'Rapor Sıralama/Filtre': (0.5, 100),
+    'Dışa Aktarım': (4.5, 50),
+}
+
+# Küçük veri setlerinde sabit maliyetler baskın olduğundan bütçenin alt sınırları
+MIN_BUDGET_SEC = 0.25
+MIN_BUDGET_MB = 50
+
+# Önceki çalıştırmaya göre bu oranın üstündeki yavaşlama gerileme sayılır
+DEFAULT_TOLERANCE = 1.5
+
+# Rapor aşamasında sorgulanan eşik ve filtre (uygulamadaki tipik kullanım)
+REPORT_THRESHOLD = 0.5
+REPORT_FILTERS = {'Contract': ['Month-to-month']}
+
+
+def run_pipeline(path, model, features, profiler):
+    """`path` veri setini uygulamanın aşamalarından geçirir; her aşama `profiler` ile ölçülür."""
+    stage = profiler.stage
+    with stage('Veri Okuma'):
+        df = read_telco_csv(path)
+    with stage('Veri Kalitesi'):
+        check_data_quality(df)
+    with stage('KPI + Segmentasyon'):
+        # Uygulamadaki gibi segmentasyon analitiğin parçasıdır; ayrıca yeniden hesaplanmaz
+        seg = compute_analytics(df, fingerprint='benchmark').segmentation
+    encoder = get_encoder(features)
+    with stage('Kodlama'):
+        X = encoder.encode(df)
+    with stage('Toplu Tahmin'):
+        probs = predict_risk(model, X)
+    with stage('Rapor Sıralama/Filtre'):
+        # Uygulamadaki tarama sonucu gibi: eşik üstü satırlar + segment, ardından sıralı indeks sorguları
+        kept = probs > KEEP_THRESHOLD
+        frame = df.loc[kept, [c for c in REPORT_COLUMNS if c in df.columns]].reset_index(drop=True)
+        frame['Risk_Skoru'] = probs[kept]
+        frame['Segment'] = segment_customers(frame['tenure'], frame['MonthlyCharges'], seg.tenure_med, seg.charge_med)
+        report = RiskReport(frame)
+        report.count(REPORT_THRESHOLD, REPORT_FILTERS)
+        report.page(REPORT_THRESHOLD, REPORT_FILTERS)
+    with tempfile.TemporaryDirectory() as tmp:
+        with stage('Dışa Aktarım'):
+            write_report(report.iter_view(REPORT_THRESHOLD), os.path.join(tmp, 'rapor.csv'))
+    return profiler
+
+
+def budget(stage, rows, scale=1.0):
+    """(saniye, MB) bütçesi; satır sayısıyla doğrusal, alt sınırlarla."""
+    sec, mb = STAGE_BUDGETS[stage]
+    return max(sec * rows / 1e6 * scale, MIN_BUDGET_SEC), max(mb * rows / 1e6, MIN_BUDGET_MB)
+
+
+def benchmark(sizes, model_path=MODEL_PATH, features_path=FEATURES_PATH, seed=0, memory=True, workdir=None):
+    """Her boyut için {aşama: {'seconds', 'peak_mb'}} sonuçlarını döndürür."""
+    model = load_model(model_path)
+    features = load_features(features_path)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f'sentetik_{rows}.csv')
+            write_synthetic(path, rows, seed)
+            timed = run_pipeline(path, model, features, StageProfiler())
+            traced = run_pipeline(path, model, features, StageProfiler(trace_memory=True)) if memory else None
+            results[rows] = {
+                s.name: {'seconds': s.seconds, 'peak_mb': traced.stages[i].peak_mb if traced else None}
+                for i, s in enumerate(timed.stages)
+            }
+            os.remove(path)
+    return results
+
+
+def check_regressions(results, baseline=None, tolerance=DEFAULT_TOLERANCE, budget_scale=1.0):
+    """Bütçe veya önceki çalıştırma aşımlarını (boyut, aşama, açıklama) listesi olarak döndürür."""
+    failures = []
+    for rows, stages in results.items():
+        previous = (baseline or {}).get(str(rows), {})
+        for stage, measured in stages.items():
+            max_sec, max_mb = budget(stage, rows, budget_scale)
+            if measured['seconds'] > max_sec:
+                failures.append((rows, stage, f"{measured['seconds']:.2f} sn > bütçe {max_sec:.2f} sn"))
+            if measured['peak_mb'] is not None and measured['peak_mb'] > max_mb:
+                failures.append((rows, stage, f"{measured['peak_mb']:.0f} MB > bütçe {max_mb:.0f} MB"))
+            before = previous.get(stage, {}).get('seconds')
+            if before and measured['seconds'] > max(before * tolerance, MIN_BUDGET_SEC):
+                failures.append((rows, stage, f"{measured['seconds']:.2f} sn, önceki {before:.2f} sn (x{tolerance} üstü)"))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnGuard boru hattı benchmark'ı (sentetik Telco verisi)")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--features', default=FEATURES_PATH)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="Tepe bellek geçişini atla (yalnızca süreler)")
+    parser.add_argument('--save', default=None, help="Sonuçları JSON olarak kaydet (sonraki çalıştırmalara referans)")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="Süre bütçelerinin çarpanı")
+    parser.add_argument('--workdir', default=None, help="Sentetik CSV'lerin geçici dizini")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.rows, args.model, args.features, args.seed, not args.no_memory, args.workdir)
+    for rows, stages in results.items():
+        print(f"\n{rows:,} satır")
+        print(f"  {'Aşama':<24} {'Süre (sn)':>10} {'Satır/sn':>12} {'Tepe (MB)':>10} {'Bütçe (sn)':>11}")
+        for stage, measured in stages.items():
+            peak = f"{measured['peak_mb']:.0f}" if measured['peak_mb'] is not None else '-'
+            print(f"  {stage:<24} {measured['seconds']:>10.3f} {rows / measured['seconds']:>12,.0f} {peak:>10} "
+                  f"{budget(stage, rows, args.budget_scale)[0]:>11.2f}")
+        print(f"  {'Toplam':<24} {sum(m['seconds'] for m in stages.values()):>10.3f}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({str(rows): stages for rows, stages in results.items()}, f, ensure_ascii=False, indent=2)
+
+    failures = check_regressions(results, baseline, args.tolerance, args.budget_scale)
+    for rows, stage, message in failures:
+        print(f"GERİLEME [{rows:,} satır] {stage}: {message}")
+    print("\nTüm aşamalar eşiklerin altında." if not failures else f"\n{len(failures)} eşik aşımı.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Disk önbellek dizinleri için sınırlı boyut: en uzun süredir kullanılmayan dosyalar önce silinir."""
+import os
+
+
+def touch(path):
+    """Önbellekten okunan dosyanın değişiklik zamanını günceller (kullanım sırası mtime ile izlenir)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune(directory, suffix, max_files, max_mb, keep=None):
+    """`directory` içindeki `suffix` uzantılı dosyaları sayı ve toplam boyut sınırına indirir.
+
+    Dosyalar mtime'a göre en eskiden başlanarak silinir; `keep` (yeni yazılan dosya)
+    hiçbir zaman silinmez. Başka süreçte açık ya da silinmiş dosyalar atlanır.
+    Silinen dosya sayısını döndürür.
+    """
+    entries = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, path))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    count = len(entries)
+    removed = 0
+    for _, size, path in entries:
+        if count <= max_files and total <= max_mb * 1e6:
+            break
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(path)
+        except OSError:  # Windows'ta bellek eşlemli açık dosyalar silinemez; sonraki budamada denenir
+            continue
+        count -= 1
+        total -= size
+        removed += 1
+    return removed
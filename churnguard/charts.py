@@ -0,0 +1,165 @@
+"""Analiz sekmesi grafikleri: sabit kutulu özet verileri ve diskte önbelleklenen PNG çizimleri.
+
+Grafik maliyeti portföy boyutundan bağımsızdır: yoğunluk eğrileri ham değerler
+yerine sabit sayıda kutunun sayımlarından, çubuk grafikler ise analitik
+tablolarından çizilir.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+
+import numpy as np
+
+from churnguard.cache_files import prune, touch
+from churnguard.config import CACHE_DIR, CHART_CACHE_MAX_FILES, CHART_CACHE_MAX_MB
+
+# Yoğunluk ızgarasındaki kutu sayısı
+DENSITY_BINS = 256
+
+# Eğrinin veri aralığının dışına uzatıldığı bant genişliği katı (seaborn kdeplot 'cut' ile aynı)
+DENSITY_CUT = 3
+
+# Çizim kodu değiştiğinde eski PNG'lerin kullanılmaması için sürüm
+CHART_VERSION = 1
+
+CHART_DIR = os.path.join(CACHE_DIR, 'charts')
+
+_PNG_LOCK = threading.Lock()
+
+
+@dataclass
+class ChargeDensity:
+    """Ayrılan ve kalan müşterilerin aylık ücret yoğunlukları (ortak ızgara üzerinde)."""
+    grid: np.ndarray
+    churn: np.ndarray
+    retained: np.ndarray
+
+
+def scott_bandwidth(values):
+    """Scott kuralı bant genişliği (scipy gaussian_kde varsayılanı)."""
+    n = len(values)
+    return scott_bandwidth_from_moments(n, float(np.var(values, ddof=1)) if n >= 2 else 0.0)
+
+
+def scott_bandwidth_from_moments(n, variance):
+    """Sayı ve örneklem varyansından Scott bant genişliği (parça parça biriktirilen veriler için)."""
+    if n < 2:
+        return 1.0
+    std = float(np.sqrt(variance))
+    return std * n ** (-1 / 5) if std > 0 else 1.0
+
+
+def density_edges(lo, hi, bw_churn, bw_retained, bins=DENSITY_BINS, cut=DENSITY_CUT):
+    """Yoğunluk ızgarasının kutu kenarları: veri aralığı, iki bant genişliğinin büyüğü kadar uzatılır."""
+    pad = cut * max(bw_churn, bw_retained)
+    return np.linspace(lo - pad, hi + pad, bins + 1)
+
+
+def binned_kde(values, edges, bandwidth):
+    """Gauss çekirdekli yoğunluğu ham değerler yerine kutu sayımlarından hesaplar.
+
+    Değerler tek geçişte kutulara sayılır, sayımlar ayrık Gauss çekirdeğiyle
+    evriştirilir; maliyet satır sayısına değil kutu sayısına bağlıdır.
+    """
+    counts, _ = np.histogram(values, bins=edges)
+    return kde_from_counts(counts, edges, bandwidth)
+
+
+def kde_from_counts(counts, edges, bandwidth):
+    """Kutu sayımlarından (parçalar boyunca toplanabilir) Gauss yoğunluğu."""
+    n = counts.sum()
+    width = edges[1] - edges[0]
+    if n == 0:
+        return np.zeros(len(edges) - 1)
+    half = max(int(np.ceil(4 * bandwidth / width)), 1)
+    offsets = np.arange(-half, half + 1) * width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    smoothed = np.convolve(counts, kernel, mode='same') if half < len(counts) else \
+        np.convolve(counts, kernel, mode='full')[half:half + len(counts)]
+    return smoothed / (n * width)
+
+
+def charge_density(charges, is_churn, bins=DENSITY_BINS, cut=DENSITY_CUT):
+    """İki grubun yoğunluğunu ortak ızgarada hesaplar; eksik ücretler yok sayılır."""
+    charges = np.asarray(charges, dtype=np.float64)
+    is_churn = np.asarray(is_churn, dtype=bool)
+    valid = ~np.isnan(charges)
+    churned, retained = charges[valid & is_churn], charges[valid & ~is_churn]
+    if not valid.any():
+        return ChargeDensity(np.empty(0), np.empty(0), np.empty(0))
+
+    bw_churn, bw_retained = scott_bandwidth(churned), scott_bandwidth(retained)
+    edges = density_edges(charges[valid].min(), charges[valid].max(), bw_churn, bw_retained, bins, cut)
+    grid = (edges[:-1] + edges[1:]) / 2
+    return ChargeDensity(grid, binned_kde(churned, edges, bw_churn), binned_kde(retained, edges, bw_retained))
+
+
+def render_png(key, draw):
+    """`draw()` ile üretilen figürü PNG olarak döndürür; sonuç diskte `key` adıyla saklanır.
+
+    Önbellek dosya sayısı ve boyutla sınırlıdır; en uzun süredir kullanılmayan PNG'ler silinir.
+    """
+    path = os.path.join(CHART_DIR, f'{key}.v{CHART_VERSION}.png')
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                png = f.read()
+            touch(path)
+            return png
+        except FileNotFoundError:  # başka bir oturum tarafından tam bu sırada silindiyse yeniden çizilir
+            pass
+
+    fig = draw()
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=200, bbox_inches='tight')
+    import matplotlib.pyplot as plt  # figür çizildiyse zaten yüklüdür
+    plt.close(fig)
+    png = buf.getvalue()
+    with _PNG_LOCK:
+        os.makedirs(CHART_DIR, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, path)
+        prune(CHART_DIR, '.png', CHART_CACHE_MAX_FILES, CHART_CACHE_MAX_MB, keep=path)
+    return png
+
+
+def draw_segments(plt, sns, segment_counts):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(data=segment_counts, x='Segment', y='count', palette='viridis', ax=ax)
+    return fig
+
+
+def draw_contracts(plt, sns, contract_churn):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(x=contract_churn.index, y=contract_churn.values, palette='magma', ax=ax)
+    return fig
+
+
+def draw_services(plt, sns, service_churn):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.lineplot(x=service_churn.index, y=service_churn.values, marker='o', color='green', ax=ax)
+    return fig
+
+
+def draw_payments(plt, sns, payment_churn):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    sns.barplot(data=payment_churn, y='PaymentMethod', x='count', palette='flare', ax=ax)
+    return fig
+
+
+def draw_density(plt, density, kritik_esik):
+    """Önceden hesaplanmış yoğunluklardan fatura yoğunluğu grafiğini çizer."""
+    fig, ax = plt.subplots(figsize=(20, 5))
+    for values, label, color in ((density.churn, "Ayrılan", "red"), (density.retained, "Kalan", "green")):
+        ax.fill_between(density.grid, values, color=color, alpha=0.25, linewidth=0)
+        ax.plot(density.grid, values, color=color, label=label)
+    ax.axvline(kritik_esik, color='black', linestyle='--')
+    ax.set_xlabel('MonthlyCharges')
+    ax.set_ylabel('Density')
+    ax.set_ylim(bottom=0)
+    ax.legend()
+    return fig
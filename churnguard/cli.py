@@ -0,0 +1,76 @@
+"""Dosyadan dosyaya toplu skorlama.
+
+Kullanım:
+    python -m churnguard.cli portfoy.csv skorlar.csv --n-jobs 8 --threshold 0.5
+    python -m churnguard.cli portfoy.csv en_riskli.parquet --top-k 10000
+
+Çıktı biçimi uzantıdan belirlenir: .csv, .csv.gz, .parquet, .xlsx
+"""
+import argparse
+import sys
+import time
+
+import joblib
+
+from churnguard.config import FEATURES_PATH, MODEL_PATH, N_JOBS
+from churnguard.encoding import get_encoder
+from churnguard.export import TopK, format_for_path, write_report
+from churnguard.parallel import ParallelScorer
+from churnguard.streaming import DEFAULT_CHUNKSIZE, ScanProgress, iter_scored_chunks
+
+
+def score_file(input_path, output_path, model_path=MODEL_PATH, features_path=FEATURES_PATH,
+               chunksize=DEFAULT_CHUNKSIZE, n_jobs=N_JOBS, threshold=None, id_column='customerID', top_k=None):
+    """Girdi CSV'sini parça parça skorlayıp `id_column` + Risk_Skoru olarak yazar.
+
+    `top_k` verilirse yalnızca en riskli K müşteri (azalan sırada) yazılır; parçalar
+    arasında tam sıralama yerine kısmi seçim yapıldığından bellek K ile sınırlıdır.
+    """
+    encoder = get_encoder(joblib.load(features_path))
+    scorer = ParallelScorer(model_path, n_jobs=n_jobs)
+    progress = ScanProgress()
+
+    def results():
+        for chunk, probs in iter_scored_chunks(input_path, encoder, scorer, chunksize * max(n_jobs, 1),
+                                               extra_columns=(id_column,), progress=progress):
+            result = chunk[[id_column]].copy() if id_column in chunk.columns else chunk.index.to_frame(name='row')
+            result['Risk_Skoru'] = probs
+            if threshold is not None:
+                result = result[probs > threshold]
+            print(f"\r{progress.rows:,} satır skorlandı (%{progress.fraction * 100:.0f})", end='', file=sys.stderr)
+            yield result
+
+    fmt, compress = format_for_path(output_path)
+    if top_k is not None:
+        best = TopK(top_k)
+        for result in results():
+            best.push(result)
+        written = write_report([best.result()], output_path, fmt, compress)
+    else:
+        written = write_report(results(), output_path, fmt, compress)
+    print(file=sys.stderr)
+    return progress.rows, written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnGuard dosyadan dosyaya toplu skorlama")
+    parser.add_argument('input', help="Telco şemasında girdi CSV")
+    parser.add_argument('output', help="Çıktı dosyası (customerID, Risk_Skoru): .csv, .csv.gz, .parquet veya .xlsx")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--features', default=FEATURES_PATH)
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument('--n-jobs', type=int, default=N_JOBS)
+    parser.add_argument('--threshold', type=float, default=None, help="Yalnızca bu riskin üzerindekileri yaz")
+    parser.add_argument('--top-k', type=int, default=None, help="Yalnızca en riskli K müşteriyi yaz")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows, written = score_file(args.input, args.output, args.model, args.features,
+                               args.chunksize, args.n_jobs, args.threshold, top_k=args.top_k)
+    elapsed = time.perf_counter() - started
+    print(f"{rows:,} müşteri skorlandı, {written:,} satır yazıldı ({elapsed:.1f} sn, {rows / max(elapsed, 1e-9):,.0f} satır/sn)",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
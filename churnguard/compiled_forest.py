@@ -0,0 +1,269 @@
+"""Random Forest modelinin düz dizilere derlenmiş, düşük gecikmeli çıkarım biçimi.
+
+Dışa aktarım ve sklearn ile birebirlik (parity) kontrolü:
+    python -m churnguard.compiled_forest --model churn_model_v2_recall73.pkl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from churnguard.config import DEFAULT_DATA_PATH, FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import get_encoder
+from churnguard.scoring import predict_risk
+
+ARRAYS = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots')
+
+# Kaydedilen dizin biçimi; eski biçimdeki dizinler yüklenmez, yeniden derlenir
+FORMAT_VERSION = 2
+
+# Satır x ağaç düğüm matrisinin boyutunu sınırlamak için satır bloğu
+BLOCK_ROWS = 16_384
+
+# Katkı hesabında satır x ağaç x derinlik yol matrisi oluştuğundan daha küçük blok
+CONTRIB_BLOCK_ROWS = 2048
+
+# Derlenmiş yol sklearn'ün doğrulama/dağıtım maliyetinin baskın olduğu küçük
+# girdilerde kazançlıdır; daha büyük toplu işlerde sklearn'ün Cython döngüsü hızlıdır.
+COMPILED_MAX_ROWS = 1024
+
+
+class CompiledForest:
+    """Tüm ağaçların düğümlerini ardışık NumPy dizilerinde tutan orman.
+
+    Yaprak düğümler kendilerine işaret eder (eşik = +inf), bu sayede tüm satırlar
+    ve tüm ağaçlar dalsız olarak `max_depth` adımda birlikte ilerletilir. Eksik (NaN)
+    değerler sklearn'deki gibi düğümün öğrenilmiş yönüne (`missing_left`) gider.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth, n_features,
+                 source=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.source = source
+        self._paths = None
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        """Düğüm dizileri ve (hesaplandıysa) yaprak yolu tablosunun toplam boyutu."""
+        size = sum(getattr(self, name).nbytes for name in ARRAYS)
+        if self._paths is not None:
+            size += sum(a.nbytes for a in self._paths)
+        return size
+
+    @classmethod
+    def from_sklearn(cls, model, source=None):
+        """Ağaç tabanlı sınıflandırıcıyı (RandomForest/ExtraTrees) derler."""
+        estimators = getattr(model, 'estimators_', None)
+        if not estimators or not all(hasattr(e, 'tree_') for e in estimators):
+            raise TypeError(f"{type(model).__name__} derlenebilir bir ağaç topluluğu değil")
+
+        pos_class = list(model.classes_).index(1) if 1 in model.classes_ else 1
+        feature, threshold, left, right, missing_left, value, roots = [], [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for est in estimators:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n, dtype=np.int32)
+            counts = tree.value[:, 0, :]
+            feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+            right.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+            missing_left.append(np.asarray(tree.missing_go_to_left, dtype=bool) & ~is_leaf)
+            value.append(counts[:, pos_class] / counts.sum(axis=1))
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(np.concatenate(feature), np.concatenate(threshold), np.concatenate(left),
+                   np.concatenate(right), np.concatenate(missing_left), np.concatenate(value),
+                   np.asarray(roots, dtype=np.int32),
+                   max_depth, model.n_features_in_, source)
+
+    def leaves(self, X):
+        """Her satırın her ağaçta düştüğü yaprak düğümünü (n_satır, n_ağaç) döndürür."""
+        X = np.ascontiguousarray(X)
+        flat = X.ravel()
+        row_base = (np.arange(len(X), dtype=np.int64) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            x = flat.take(row_base + self.feature.take(node))
+            go_left = np.where(np.isnan(x), self.missing_left.take(node), x <= self.threshold.take(node))
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        return node
+
+    def predict_risk(self, X):
+        """Terk (sınıf 1) olasılıklarını döndürür; sklearn predict_proba[:, 1] ile aynıdır."""
+        n = len(X)
+        out = np.empty(n, dtype=np.float64)
+        for start in range(0, n, BLOCK_ROWS):
+            block = X[start:start + BLOCK_ROWS]
+            out[start:start + len(block)] = self.value[self.leaves(block)].mean(axis=1)
+        return out
+
+    def leaf_paths(self):
+        """Her yaprağın kökten yaprağa yol istatistikleri (bir kez hesaplanır, önbelleklenir).
+
+        (yaprak sırası, yol özelliği, yol değer değişimi) döndürür: `leaf_index[node]`
+        yaprağın satırını, `path_feature`/`path_delta` (n_yaprak, max_depth) ise yol
+        boyunca bölünen özellikleri ve o bölünmenin düğüm değerinde yarattığı değişimi
+        verir. Kısa yollar sıfır değişimle doldurulur.
+        """
+        if self._paths is None:
+            own = np.arange(len(self.value), dtype=np.int32)
+            is_leaf = self.left == own
+            parent = np.full(len(own), -1, dtype=np.int64)
+            inner = own[~is_leaf]
+            parent[self.left[inner]] = inner
+            parent[self.right[inner]] = inner
+
+            leaves = own[is_leaf]
+            leaf_index = np.full(len(own), -1, dtype=np.int64)
+            leaf_index[leaves] = np.arange(len(leaves))
+            path_feature = np.zeros((len(leaves), max(self.max_depth, 1)), dtype=np.int64)
+            path_delta = np.zeros((len(leaves), max(self.max_depth, 1)), dtype=np.float64)
+            node = leaves.astype(np.int64)
+            for depth in range(self.max_depth):
+                up = parent[node]
+                active = up >= 0
+                path_feature[active, depth] = self.feature[up[active]]
+                path_delta[active, depth] = self.value[node[active]] - self.value[up[active]]
+                node = np.where(active, up, node)
+            self._paths = leaf_index, path_feature, path_delta
+        return self._paths
+
+    def contributions(self, X):
+        """Yol tabanlı (Saabas) özellik katkıları: (taban değer, (n_satır, n_özellik) katkı matrisi).
+
+        Her ağaçta kökten yaprağa inerken düğüm değerindeki değişim, o düğümde
+        bölünen özelliğe yazılır; taban + satır katkılarının toplamı `predict_risk`
+        ile aynıdır. Satırlar `leaves` ile yapraklara indirilir, katkılar önceden
+        hesaplanmış yaprak yollarından tek bir `bincount` ile toplanır.
+        """
+        leaf_index, path_feature, path_delta = self.leaf_paths()
+        n = len(X)
+        out = np.zeros((n, self.n_features), dtype=np.float64)
+        for start in range(0, n, CONTRIB_BLOCK_ROWS):
+            block = X[start:start + CONTRIB_BLOCK_ROWS]
+            rows = len(block)
+            paths = leaf_index[self.leaves(block)]
+            out_base = (np.arange(rows, dtype=np.int64) * self.n_features)[:, None, None]
+            out[start:start + rows] = np.bincount(
+                (out_base + path_feature[paths]).ravel(), weights=path_delta[paths].ravel(),
+                minlength=rows * self.n_features).reshape(rows, self.n_features)
+        return float(self.value[self.roots].mean()), out / self.n_trees
+
+    def save(self, path):
+        """Dizileri ayrı .npy dosyaları olarak kaydeder (bellek eşlemli yüklenebilir)."""
+        os.makedirs(path, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        meta = {'format': FORMAT_VERSION, 'max_depth': self.max_depth, 'n_features': self.n_features, 'n_trees': self.n_trees, 'source': self.source}
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"{path}: eski derlenmiş orman biçimi ({meta.get('format')})")
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None) for name in ARRAYS}
+        return cls(**arrays, max_depth=meta['max_depth'], n_features=meta['n_features'], source=meta.get('source'))
+
+
+def model_signature(model_path):
+    """Model dosyasının boyut + değişiklik zamanı imzası (derlenmiş dosyanın güncelliği için)."""
+    st = os.stat(model_path)
+    return f"{os.path.basename(model_path)}:{st.st_size}:{int(st.st_mtime)}"
+
+
+def compiled_path_for(model_path):
+    """Model dosyasının yanındaki derlenmiş dizin yolu (ör. model.pkl -> model.forest)."""
+    return os.path.splitext(model_path)[0] + '.forest'
+
+
+def load_or_compile(model, model_path=MODEL_PATH):
+    """Güncel bir derlenmiş dosya varsa bellek eşlemli yükler, yoksa bellekte derler."""
+    signature = model_signature(model_path) if model_path and os.path.exists(model_path) else None
+    compiled_path = compiled_path_for(model_path) if model_path else None
+    if signature and os.path.isdir(compiled_path):
+        try:
+            forest = CompiledForest.load(compiled_path)
+        except (OSError, ValueError):
+            forest = None
+        if forest is not None and forest.source == signature:
+            return forest
+    return CompiledForest.from_sklearn(model, source=signature)
+
+
+def fast_score_fn(model, model_path=MODEL_PATH, forest=None):
+    """Küçük girdileri derlenmiş ormanla, büyükleri sklearn ile skorlayan fonksiyon döndürür."""
+    sklearn_fn = partial(predict_risk, model)
+    if forest is None:
+        try:
+            forest = load_or_compile(model, model_path)
+        except TypeError:
+            return sklearn_fn
+
+    def score(X):
+        return forest.predict_risk(X) if len(X) <= COMPILED_MAX_ROWS else sklearn_fn(X)
+    return score
+
+
+def verify_parity(model, forest, X, atol=1e-12):
+    """Derlenmiş orman ile sklearn skorları arasındaki en büyük mutlak farkı kontrol eder."""
+    diff = float(np.max(np.abs(forest.predict_risk(X) - predict_risk(model, X)))) if len(X) else 0.0
+    return diff <= atol, diff
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Random Forest modelini düz dizi biçimine derler ve doğrular")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--features', default=FEATURES_PATH)
+    parser.add_argument('--out', default=None, help="Varsayılan: model dosyasının yanında .forest dizini")
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help="Birebirlik kontrolü için veri seti")
+    args = parser.parse_args(argv)
+
+    out = args.out or compiled_path_for(args.model)
+    model = joblib.load(args.model)
+    forest = CompiledForest.from_sklearn(model, source=model_signature(args.model))
+    forest.save(out)
+    forest = CompiledForest.load(out)
+    print(f"{forest.n_trees} ağaç, {len(forest.value):,} düğüm, {forest.nbytes / 1e6:.1f} MB -> {out}")
+
+    X = get_encoder(joblib.load(args.features)).encode(pd.read_csv(args.data))
+    ok, diff = verify_parity(model, forest, X)
+    print(f"Birebirlik kontrolü ({len(X):,} satır): en büyük fark {diff:.2e} -> {'BAŞARILI' if ok else 'BAŞARISIZ'}")
+
+    row = X[:1]
+    for fn, label in ((forest.predict_risk, 'derlenmiş'), (partial(predict_risk, model), 'sklearn')):
+        fn(row)
+        started = time.perf_counter()
+        for _ in range(200):
+            fn(row)
+        print(f"Tekil skor gecikmesi ({label}): {(time.perf_counter() - started) / 200 * 1000:.3f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
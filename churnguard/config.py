@@ -0,0 +1,41 @@
+import os
+
+# Varsayılan model, özellik listesi ve eğitim veri seti dosyaları
+MODEL_PATH = 'churn_model_v2_recall73.pkl'
+FEATURES_PATH = 'features_v2.pkl'
+DEFAULT_DATA_PATH = 'WA_Fn-UseC_-Telco-Customer-Churn.csv'
+
+# Toplu skorlamada kullanılacak işçi süreç sayısı (ortam değişkeniyle ezilebilir)
+N_JOBS = int(os.environ.get('CHURNGUARD_N_JOBS', os.cpu_count() or 1))
+
+# Bu boyutun (MB) üstündeki yüklemeler DataFrame olarak belleğe alınmaz; KPI'lar ve
+# grafik verileri parça parça hesaplanır, portföy taraması zaten akışlıdır
+STREAMED_UPLOAD_MB = float(os.environ.get('CHURNGUARD_STREAMED_UPLOAD_MB', 100))
+
+# Ayrıştırılmış veri setlerinin Arrow IPC önbellek dizini
+CACHE_DIR = os.environ.get('CHURNGUARD_CACHE_DIR', '.churnguard_cache')
+
+# Ayrıştırılmış veri seti önbelleğinin sınırları (her farklı yükleme bir dosya ekler);
+# aşılınca en uzun süredir kullanılmayan dosyalar silinir
+DATA_CACHE_MAX_FILES = int(os.environ.get('CHURNGUARD_DATA_CACHE_FILES', 16))
+DATA_CACHE_MAX_MB = float(os.environ.get('CHURNGUARD_DATA_CACHE_MB', 2048))
+
+# Analiz sekmesi PNG grafik önbelleğinin sınırları (veri seti x grafik başına bir dosya)
+CHART_CACHE_MAX_FILES = int(os.environ.get('CHURNGUARD_CHART_CACHE_FILES', 200))
+CHART_CACHE_MAX_MB = float(os.environ.get('CHURNGUARD_CHART_CACHE_MB', 200))
+
+# Eşzamanlı çalışan arka plan tarama işi sayısı (oturumlar arası); fazlası sırada bekler
+SCAN_JOB_WORKERS = int(os.environ.get('CHURNGUARD_SCAN_JOBS', 2))
+
+# Artımlı taramada kullanılan müşteri bazlı skor deposu
+SCORE_STORE_PATH = os.environ.get('CHURNGUARD_SCORE_STORE', os.path.join(CACHE_DIR, 'scores.sqlite'))
+
+# Sürümlü model kayıt dizini: <kök>/<model adı>/<sürüm>/{model.pkl, features.pkl, meta.json}
+MODEL_REGISTRY_DIR = os.environ.get('CHURNGUARD_MODEL_REGISTRY', 'models')
+
+# Bellekte tutulan en fazla model sayısı ve toplam bellek bütçesi (MB)
+MODEL_CACHE_SIZE = int(os.environ.get('CHURNGUARD_MODEL_CACHE_SIZE', 3))
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get('CHURNGUARD_MODEL_MEMORY_MB', 1024))
+
+# Artımlı (birleştirilebilir özetli) portföy KPI durumu
+STATS_PATH = os.environ.get('CHURNGUARD_STATS_PATH', os.path.join(CACHE_DIR, 'portfolio_stats.json'))
@@ -0,0 +1,184 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+# Modelin doğrudan sayısal olarak kullandığı sütunlar. Geri kalan her özellik
+# "<HamSütun>_<Değer>" biçiminde bir One-Hot sütunudur.
+NUMERIC_FEATURES = ('tenure', 'MonthlyCharges', 'TotalCharges', 'TotalCharges_Calculated', 'SeniorCitizen')
+
+# Kayıtta boş bırakılabilen sayısal sütunlar (yeni müşterilerde tenure * MonthlyCharges ile tamamlanır)
+OPTIONAL_NUMERIC = ('TotalCharges',)
+
+
+class RecordError(ValueError):
+    """Skorlanacak bir kaydın eksik veya hatalı alanı; `index` kaydın sırası, `field` alan adıdır."""
+
+    def __init__(self, index, field, message):
+        super().__init__(f"Kayıt {index}: '{field}' {message}")
+        self.index = index
+        self.field = field
+
+
+class FeatureEncoder:
+    """Ham Telco sütunlarını modelin beklediği yoğun float32 matrise dönüştürür.
+
+    Özellik listesi bir kez çözümlenir; her kategorik sütun için değer -> sütun
+    indeksi tablosu önceden hazırlanır. Kodlama sırasında kategori kodları
+    tek seferde hesaplanıp doğrudan matrise yazılır (maske/döngü yok).
+    """
+
+    def __init__(self, features):
+        self.features = list(features)
+        self.n_features = len(self.features)
+        self.index = {name: i for i, name in enumerate(self.features)}
+
+        self.numeric = {name: self.index[name] for name in NUMERIC_FEATURES if name in self.index}
+
+        # Kategorik sütun -> (kategori değerleri, her değerin matris sütun indeksi)
+        groups = {}
+        for i, name in enumerate(self.features):
+            if name in self.numeric or '_' not in name:
+                continue
+            col, val = name.split('_', 1)
+            groups.setdefault(col, ([], []))
+            groups[col][0].append(val)
+            groups[col][1].append(i)
+        self.categorical = {col: (pd.Index(vals), np.asarray(idx, dtype=np.intp))
+                            for col, (vals, idx) in groups.items()}
+
+    @property
+    def raw_columns(self):
+        """Kodlama için okunan ham veri sütunları."""
+        needed = set(self.numeric)
+        if needed & {'TotalCharges', 'TotalCharges_Calculated'}:
+            needed |= {'tenure', 'MonthlyCharges'}
+        return [c for c in ('tenure', 'MonthlyCharges', 'TotalCharges', 'SeniorCitizen') if c in needed] + list(self.categorical)
+
+    def columns_for(self, col):
+        """Bir ham kategorik sütuna ait One-Hot sütun indekslerini döndürür."""
+        return self.categorical[col][1] if col in self.categorical else np.empty(0, dtype=np.intp)
+
+    def encode(self, df):
+        """DataFrame'i (n_satır, n_özellik) boyutlu float32 matrise kodlar."""
+        n = len(df)
+        X = np.zeros((n, self.n_features), dtype=np.float32)
+        if n == 0:
+            return X
+
+        tenure = _numeric(df, 'tenure')
+        charges = _numeric(df, 'MonthlyCharges')
+        calculated = tenure * charges if tenure is not None and charges is not None else None
+
+        if 'tenure' in self.numeric and tenure is not None:
+            X[:, self.numeric['tenure']] = tenure
+        if 'MonthlyCharges' in self.numeric and charges is not None:
+            X[:, self.numeric['MonthlyCharges']] = charges
+        if 'SeniorCitizen' in self.numeric and 'SeniorCitizen' in df.columns:
+            X[:, self.numeric['SeniorCitizen']] = _numeric(df, 'SeniorCitizen')
+        if 'TotalCharges_Calculated' in self.numeric and calculated is not None:
+            X[:, self.numeric['TotalCharges_Calculated']] = calculated
+        if 'TotalCharges' in self.numeric:
+            # Gerçek TotalCharges varsa onu kullanır; boş değerleri (yeni müşteriler)
+            # ve sütunun hiç olmadığı durumu tenure * MonthlyCharges ile tamamlar.
+            total = _numeric(df, 'TotalCharges')
+            if total is None:
+                total = calculated
+            elif calculated is not None:
+                total = np.where(np.isnan(total), calculated, total)
+            if total is not None:
+                X[:, self.numeric['TotalCharges']] = total
+
+        rows = np.arange(n)
+        for col, (values, idx) in self.categorical.items():
+            if col not in df.columns:
+                continue
+            codes = _category_codes(df[col], values)
+            hit = codes >= 0
+            X[rows[hit], idx[codes[hit]]] = 1
+        return X
+
+    def set_category(self, X, col, value):
+        """Matristeki bir kategorik grubu tüm satırlar için `value` değerine sabitler."""
+        if col not in self.categorical:
+            return
+        values, idx = self.categorical[col]
+        X[:, idx] = 0
+        pos = values.get_indexer([value])[0]
+        if pos >= 0:
+            X[:, idx[pos]] = 1
+
+    def set_charges(self, X, tenure, charges):
+        """Aylık ücreti ve ondan türetilen toplam ücret sütunlarını günceller."""
+        if 'MonthlyCharges' in self.numeric:
+            X[:, self.numeric['MonthlyCharges']] = charges
+        for name in ('TotalCharges', 'TotalCharges_Calculated'):
+            if name in self.numeric:
+                X[:, self.numeric[name]] = tenure * charges
+
+    def validate_records(self, records):
+        """Kayıtların kodlama için gereken ham alanları taşıdığını denetler.
+
+        Eksik/boş alan, sayıya çevrilemeyen sayısal değer veya metin olmayan kategorik
+        değer için ilk hatalı alanı bildiren RecordError fırlatır. Aksi halde bu
+        alanlar `encode` içinde sessizce NaN/sıfır olur ve anlamsız bir skor üretilir.
+        """
+        numeric = [c for c in self.raw_columns if c not in self.categorical]
+        for i, record in enumerate(records):
+            for col in numeric:
+                value = record.get(col)
+                if _is_blank(value):
+                    if col in OPTIONAL_NUMERIC:
+                        continue
+                    raise RecordError(i, col, "alanı eksik veya boş")
+                try:
+                    ok = not isinstance(value, (dict, list)) and np.isfinite(float(value))
+                except (TypeError, ValueError):
+                    ok = False
+                if not ok:
+                    raise RecordError(i, col, f"sayısal olmalı ({value!r})")
+            for col in self.categorical:
+                value = record.get(col)
+                if _is_blank(value):
+                    raise RecordError(i, col, "alanı eksik veya boş")
+                if not isinstance(value, str):
+                    raise RecordError(i, col, f"metin olmalı ({value!r})")
+
+    def encode_records(self, records):
+        """Sözlük listesini (veya tek bir sözlüğü) kodlar; tekil tahminler için."""
+        if isinstance(records, dict):
+            records = [records]
+        return self.encode(pd.DataFrame.from_records(records))
+
+    def to_frame(self, X):
+        """Kodlanmış matrisi özellik isimleriyle DataFrame'e çevirir."""
+        return pd.DataFrame(X, columns=self.features)
+
+
+def _category_codes(series, values):
+    """Sütun değerlerinin `values` içindeki konumları (bilinmeyen değer: -1)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Zaten kategorik ise yalnızca kategori tablosu eşlenir, satırlar yeniden hash'lenmez
+        lookup = np.append(values.get_indexer(series.cat.categories), -1)
+        return lookup[series.cat.codes.to_numpy()]
+    return values.get_indexer(series)
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _numeric(df, col):
+    if col not in df.columns:
+        return None
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_encoder(features):
+    return FeatureEncoder(features)
+
+
+def get_encoder(features):
+    """Aynı özellik listesi için tek bir kodlayıcı örneği döndürür."""
+    return _cached_encoder(tuple(features))
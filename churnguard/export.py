@@ -0,0 +1,190 @@
+"""Risk raporunun parça parça diske yazılan çok biçimli dışa aktarımı (CSV, Parquet, XLSX)."""
+import gzip
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from churnguard.config import CACHE_DIR
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow yoksa Parquet seçeneği sunulmaz
+    pa = pq = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl isteğe bağlıdır; yoksa XLSX seçeneği sunulmaz
+    Workbook = None
+
+EXPORT_CHUNK_ROWS = 100_000
+
+# Biçim -> (dosya uzantısı, MIME tipi)
+FORMATS = {
+    'csv': ('.csv', 'text/csv'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# Excel sayfa sınırı (başlık satırı dahil)
+XLSX_MAX_ROWS = 1_048_576
+
+
+def available_formats(rows=None):
+    """Kurulu bağımlılıklara göre kullanılabilir dışa aktarım biçimleri.
+
+    `rows` verilirse Excel sayfa sınırını aşan raporlar için XLSX sunulmaz.
+    """
+    xlsx = Workbook is not None and (rows is None or rows < XLSX_MAX_ROWS)
+    return [fmt for fmt in FORMATS if (fmt != 'parquet' or pq is not None) and (fmt != 'xlsx' or xlsx)]
+
+
+def export_filename(base, fmt, compress=False):
+    """İndirme dosya adı; gzip yalnızca CSV'ye uygulanır (Parquet/XLSX kendi içinde sıkıştırılır)."""
+    return base + FORMATS[fmt][0] + ('.gz' if compress and fmt == 'csv' else '')
+
+
+def export_mime(fmt, compress=False):
+    return 'application/gzip' if compress and fmt == 'csv' else FORMATS[fmt][1]
+
+
+def format_for_path(path):
+    """Dosya adından (biçim, gzip) çıkarır: .csv, .csv.gz, .parquet, .xlsx."""
+    name = path.lower()
+    compress = name.endswith('.gz')
+    if compress:
+        name = name[:-3]
+    for fmt, (ext, _) in FORMATS.items():
+        if name.endswith(ext):
+            return fmt, compress
+    return 'csv', compress
+
+
+def top_k_indices(scores, k):
+    """En yüksek `k` skorun konumlarını azalan sırada döndürür.
+
+    Tam sıralama yerine `argpartition` ile O(n) seçim yapılır; yalnızca seçilen
+    `k` eleman sıralanır.
+    """
+    scores = np.asarray(scores)
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class TopK:
+    """Parça parça gelen skorlardan en riskli `k` satırı sabit bellekle biriktirir."""
+
+    def __init__(self, k, score_column='Risk_Skoru'):
+        self.k = k
+        self.score_column = score_column
+        self.frame = None
+
+    def push(self, frame):
+        merged = frame if self.frame is None else pd.concat([self.frame, frame], ignore_index=True)
+        if len(merged) > self.k:
+            keep = np.argpartition(-merged[self.score_column].to_numpy(), self.k - 1)[:self.k]
+            merged = merged.take(np.sort(keep)).reset_index(drop=True)
+        self.frame = merged
+
+    def result(self):
+        if self.frame is None:
+            return pd.DataFrame()
+        return self.frame.take(top_k_indices(self.frame[self.score_column].to_numpy(), self.k)).reset_index(drop=True)
+
+
+def _write_csv(chunks, path, compress):
+    opener = gzip.open if compress else open
+    rows = 0
+    with opener(path, 'wt', newline='', encoding='utf-8') as out:
+        for chunk in chunks:
+            chunk.to_csv(out, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def _write_parquet(chunks, path, compress):
+    if pq is None:
+        raise ImportError("Parquet dışa aktarımı için pyarrow gereklidir")
+    writer, rows = None, 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression='gzip' if compress else 'snappy')
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_xlsx(chunks, path, compress):
+    if Workbook is None:
+        raise ImportError("XLSX dışa aktarımı için openpyxl gereklidir")
+    # write_only kipinde satırlar doğrudan diske akıtılır, hücre nesneleri bellekte tutulmaz
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Risk Raporu')
+    rows = 0
+    try:
+        for chunk in chunks:
+            if rows == 0:
+                ws.append([str(c) for c in chunk.columns])
+            if rows + len(chunk) >= XLSX_MAX_ROWS:
+                raise ValueError(f"XLSX en fazla {XLSX_MAX_ROWS - 1:,} satır içerebilir; CSV veya Parquet kullanın")
+            values = chunk.astype(object).where(chunk.notna(), None)
+            for row in values.itertuples(index=False, name=None):
+                ws.append(row)
+            rows += len(chunk)
+    except BaseException:
+        # Yarım kalan sayfanın geçici XML dosyası serbest bırakılır
+        ws.close()
+        raise
+    wb.save(path)
+    return rows
+
+
+_WRITERS = {'csv': _write_csv, 'parquet': _write_parquet, 'xlsx': _write_xlsx}
+
+
+def write_report(chunks, path, fmt='csv', compress=False):
+    """DataFrame parçalarını sırayla `path` dosyasına yazar; yazılan satır sayısını döndürür.
+
+    Bellekte aynı anda yalnızca bir parça bulunur. `compress` CSV'yi gzip'ler,
+    Parquet'te gzip kodlayıcısını seçer, XLSX'te (zaten zip) etkisizdir.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Bilinmeyen dışa aktarım biçimi: {fmt}")
+    return _WRITERS[fmt](chunks, path, compress)
+
+
+def export_to_tempfile(chunks, fmt='csv', compress=False):
+    """Parçaları geçici bir dosyaya yazar ve dosya yolunu döndürür."""
+    directory = os.path.join(CACHE_DIR, 'exports')
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=export_filename('', fmt, compress), dir=directory)
+    os.close(fd)
+    try:
+        write_report(chunks, path, fmt, compress)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def export_bytes(chunks, fmt='csv', compress=False):
+    """Dışa aktarımı geçici dosyaya parça parça yazar ve bitmiş dosyanın içeriğini döndürür.
+
+    Yazım sırasında bellekte yalnızca bir parça bulunur; dönen bayt dizisi ise
+    dosyanın (sıkıştırılmışsa sıkıştırılmış) tamamıdır. Geçici dosya her durumda silinir.
+    """
+    path = export_to_tempfile(chunks, fmt, compress)
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
@@ -0,0 +1,177 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from churnguard.cache_files import prune, touch
+from churnguard.config import CACHE_DIR, DATA_CACHE_MAX_FILES, DATA_CACHE_MAX_MB
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow yoksa önbelleksiz (her seferinde CSV ayrıştırma) çalışılır
+    feather = None
+
+# Şema değiştiğinde eski önbellek dosyalarının kullanılmaması için sürüm
+SCHEMA_VERSION = 1
+
+# Telco şemasındaki düşük kardinaliteli metin sütunları kategori olarak okunur
+CATEGORICAL_COLUMNS = [
+    'gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines', 'InternetService',
+    'OnlineSecurity', 'OnlineBackup', 'DeviceProtection', 'TechSupport', 'StreamingTV',
+    'StreamingMovies', 'Contract', 'PaperlessBilling', 'PaymentMethod', 'Churn',
+]
+CHARGE_COLUMNS = ['MonthlyCharges', 'TotalCharges']
+
+# Analizlerin çalışması için veri setinde mutlaka bulunması gereken sütunlar
+REQUIRED_COLUMNS = ['tenure', 'MonthlyCharges', 'Contract', 'Churn', 'InternetService', 'TechSupport', 'PaymentMethod']
+
+# read_csv için dtype eşlemesi (dosyada olmayan sütunlar pandas tarafından yok sayılır)
+CSV_DTYPES = {col: 'category' for col in CATEGORICAL_COLUMNS}
+
+# Süreç içi son yüklenen veri setleri: yeniden çalıştırmalar dosyayı tekrar okumaz
+_FRAMES = OrderedDict()
+_FRAMES_MAXSIZE = 2
+_FILE_HASHES = {}
+_LOCK = threading.Lock()
+
+
+def apply_schema(df):
+    """Ücret sütunlarını sayısala çevirir; boş TotalCharges'ı tenure * MonthlyCharges ile doldurur.
+
+    Orijinal veri setinde TotalCharges yalnızca tenure = 0 olan yeni müşterilerde
+    boştur, bu yüzden doldurulan değer pratikte 0'dır.
+    """
+    for col in CHARGE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    if 'TotalCharges' in df.columns and 'tenure' in df.columns and 'MonthlyCharges' in df.columns:
+        if pd.api.types.is_numeric_dtype(df['tenure']):
+            df['TotalCharges'] = df['TotalCharges'].fillna(df['tenure'] * df['MonthlyCharges'])
+    if 'SeniorCitizen' in df.columns and pd.api.types.is_integer_dtype(df['SeniorCitizen']):
+        df['SeniorCitizen'] = df['SeniorCitizen'].astype(np.int8)
+    return df
+
+
+def check_data_quality(df):
+    """Yüklenen verideki kritik eksikleri ve veri sağlığını denetler."""
+    errors = []
+    # Sütun varlık kontrolü
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        errors.append(f"❌ Eksik Sütunlar: {', '.join(missing)}")
+
+    # Boş (NaN) değer kontrolü
+    if df.isnull().any().any():
+        errors.append("⚠️ Veride boş (NaN) değerler var. Analizler tam doğru olmayabilir.")
+
+    # Veri tipi kontrolü (Abonelik süresi sayısal olmalıdır)
+    if 'tenure' in df.columns and not pd.api.types.is_numeric_dtype(df['tenure']):
+        errors.append("❌ 'tenure' sütunu sayısal olmalıdır.")
+
+    return errors
+
+
+def read_telco_csv(source, **kwargs):
+    """CSV'yi Telco şemasıyla (kategori dtype + sayısal ücretler) ayrıştırır."""
+    return apply_schema(pd.read_csv(source, dtype=CSV_DTYPES, **kwargs))
+
+
+def iter_telco_chunks(source, chunksize, usecols=None):
+    """CSV'yi Telco şemasıyla `chunksize` satırlık parçalar halinde okur.
+
+    `source` dosya yolu veya dosya benzeri nesnedir (ör. Streamlit yüklemesi); bellekte
+    yalnızca bir parça tutulur. `usecols` verilirse yalnızca o sütunlar okunur.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    with pd.read_csv(source, chunksize=chunksize, dtype=CSV_DTYPES,
+                     usecols=None if usecols is None else lambda c: c in usecols) as reader:
+        for chunk in reader:
+            yield apply_schema(chunk)
+
+
+def read_header(source):
+    """Veri setinin sütunlarını (0 satırlı DataFrame olarak) yalnızca başlık satırından okur."""
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    return pd.read_csv(source, nrows=0)
+
+
+def content_digest(source):
+    """Dosya yolu veya yüklenen dosyanın içerik özeti (yüklemelerde bayt kopyası alınmaz)."""
+    if isinstance(source, (str, os.PathLike)):
+        return file_digest(source)
+    return hashlib.blake2b(source.getbuffer(), digest_size=16).hexdigest()
+
+
+def file_digest(path):
+    """Dosya içeriğinin blake2b özeti; (yol, boyut, mtime) başına bir kez hesaplanır."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _LOCK:
+        if key in _FILE_HASHES:
+            return _FILE_HASHES[key]
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    digest = h.hexdigest()
+    with _LOCK:
+        _FILE_HASHES[key] = digest
+    return digest
+
+
+def _cache_path(digest):
+    return os.path.join(CACHE_DIR, f'{digest}.v{SCHEMA_VERSION}.arrow')
+
+
+def _remember(digest, df):
+    with _LOCK:
+        _FRAMES[digest] = df
+        _FRAMES.move_to_end(digest)
+        while len(_FRAMES) > _FRAMES_MAXSIZE:
+            _FRAMES.popitem(last=False)
+    return df
+
+
+def load_telco_csv(source):
+    """Dosya yolu veya yüklenen dosyadan veri setini şemalı ve önbellekli olarak yükler.
+
+    Anahtar dosya içeriğinin özetidir: aynı süreçte bellekteki DataFrame döner,
+    değilse diskteki Arrow IPC önbelleği bellek eşlemli okunur, o da yoksa CSV
+    ayrıştırılıp önbelleğe yazılır. Özet `df.attrs['fingerprint']` olarak taşınır.
+    Disk önbelleği dosya sayısı ve toplam boyutla sınırlıdır; sınır aşılınca en uzun
+    süredir kullanılmayan veri setleri silinir.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        digest = file_digest(source)
+        raw = source
+    else:
+        data = source.getvalue()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        raw = io.BytesIO(data)
+
+    with _LOCK:
+        if digest in _FRAMES:
+            _FRAMES.move_to_end(digest)
+            return _FRAMES[digest]
+
+    path = _cache_path(digest)
+    if feather is not None and os.path.exists(path):
+        df = feather.read_table(path, memory_map=True).to_pandas()
+        touch(path)
+    else:
+        df = read_telco_csv(raw)
+        if feather is not None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            feather.write_feather(df, tmp, compression='uncompressed')
+            os.replace(tmp, path)
+            prune(CACHE_DIR, '.arrow', DATA_CACHE_MAX_FILES, DATA_CACHE_MAX_MB, keep=path)
+
+    df.attrs['fingerprint'] = digest
+    return _remember(digest, df)
@@ -0,0 +1,136 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from churnguard.config import SCAN_JOB_WORKERS
+from churnguard.streaming import ScanProgress
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = 'queued', 'running', 'done', 'cancelled', 'failed'
+FINISHED = (DONE, CANCELLED, FAILED)
+
+
+class JobCancelled(Exception):
+    """İptal edilen işin bir sonraki parça sınırında durdurulması için fırlatılır."""
+
+
+class ScanJob:
+    """Arka planda çalışan tarama işinin durumu, ilerlemesi ve sonucu."""
+
+    def __init__(self, job_id, label, meta=None):
+        self.id = job_id
+        self.label = label
+        self.meta = meta or {}
+        self.status = QUEUED
+        self.progress = ScanProgress()
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """İptal ister; iş çalışıyorsa mevcut parça bittikten sonra durur."""
+        self._cancel.set()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def eta(self):
+        """Okunan bayt oranına göre kalan süre tahmini (saniye); henüz bilinmiyorsa None."""
+        fraction = self.progress.fraction
+        if self.done or not fraction:
+            return None
+        return self.elapsed * (1 - fraction) / fraction
+
+    def _on_progress(self, progress):
+        self.progress = progress
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+
+class JobManager:
+    """Tarama işlerini en fazla `max_workers` işçi iş parçacığında çalıştırır.
+
+    Süreç genelinde tek örnek olarak kullanılır (ör. `st.cache_resource`); fazla işler
+    sırada (QUEUED) bekler. Yönetici yalnızca son `keep` bitmiş işi listeler; sonuçların
+    korunması için iş nesnesini gönderen taraf (ör. oturum durumu) tutmalıdır.
+    """
+
+    def __init__(self, max_workers=SCAN_JOB_WORKERS, keep=8):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='churnguard-job')
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, label, fn, meta=None, **kwargs):
+        """`fn(**kwargs, on_progress=...)` çağrısını arka planda başlatır; ScanJob döndürür."""
+        with self._lock:
+            job = ScanJob(f'job-{next(self._ids)}', label, meta)
+            self._jobs[job.id] = job
+            self._evict()
+        self._executor.submit(self._run, job, fn, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job):
+        """Sıradaki işin önünde bekleyen iş sayısı + 1; sırada değilse 0."""
+        with self._lock:
+            if job.status != QUEUED:
+                return 0
+            queued = [j for j in self._jobs.values() if j.status == QUEUED and not j.cancel_requested]
+        return queued.index(job) + 1 if job in queued else 0
+
+    def jobs(self):
+        """En yeniden eskiye işlerin listesi."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def shutdown(self):
+        for job in self.jobs():
+            job.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _evict(self):
+        # Yalnızca bitmiş işler çıkarılır; kuyruktaki/çalışan işler sınırı geçici olarak aşabilir
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(self._jobs) - self.keep, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job, fn, kwargs):
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished = time.time()
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = fn(**kwargs, on_progress=job._on_progress)
+            job.status = DONE
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as exc:
+            job.error = exc
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._evict()
@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from churnguard.scenarios import Scenario
+
+# Kampanya ekibinin sunabildiği aday teklifler
+DEFAULT_OFFERS = [
+    Scenario("12 Ay Taahhüt İndirimi", discount=0.10, contract='One year'),
+    Scenario("VIP Sadakat Paketi", discount=0.15, tech_support='Yes'),
+    Scenario("1 Yıllık Sözleşme Geçişi", contract='One year'),
+]
+
+NO_OFFER = -1
+
+
+@dataclass
+class OfferScores:
+    """Her müşterinin mevcut riski ve her teklif altındaki riski."""
+    offers: list
+    base_risk: np.ndarray
+    offer_risk: np.ndarray
+    charges: np.ndarray
+
+
+@dataclass
+class OfferPlan:
+    """Bütçe altında seçilen teklif ataması ve beklenen kazanç."""
+    offer: np.ndarray
+    gain: np.ndarray
+    cost: np.ndarray
+    budget: float
+
+    @property
+    def expected_saved(self):
+        return float(self.gain.sum())
+
+    @property
+    def spent(self):
+        return float(self.cost.sum())
+
+
+def score_offers(engine, df, offers=DEFAULT_OFFERS):
+    """Portföyü mevcut durum + her teklif için tek senaryo ızgarasında skorlar."""
+    risk = engine.run(df, [Scenario("Mevcut Durum")] + list(offers))
+    charges = pd.to_numeric(df['MonthlyCharges'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    return OfferScores(list(offers), risk[:, 0], risk[:, 1:], charges)
+
+
+def optimize_offers(scores, budget, horizon=12):
+    """Toplam indirim bütçesi altında beklenen kurtarılan geliri maksimize eder.
+
+    Kazanç = risk düşüşü x MonthlyCharges x ufuk (ay), maliyet = indirim oranı x
+    MonthlyCharges x ufuk. Çoklu seçimli sırt çantası problemi, her müşterinin
+    (maliyet, kazanç) zarfı üzerindeki artımlı adımların verimlilik sırasına göre
+    açgözlü seçimiyle çözülür; bütçeye sığmayan bir adımdan sonra sığan daha ucuz
+    adımlarla doldurmaya devam edilir. Tüm adımlar müşteriler üzerinde vektöreldir.
+    """
+    n, k = scores.offer_risk.shape
+    discounts = np.array([o.discount for o in scores.offers], dtype=np.float64)
+    value = scores.charges * horizon
+    gain = (scores.base_risk[:, None] - scores.offer_risk) * value[:, None]
+    cost = discounts[None, :] * value[:, None]
+
+    # Teklif yok seçeneği (0, 0) ilk sütun olarak eklenir; kazançsız teklifler elenir
+    G = np.concatenate([np.zeros((n, 1)), np.where(gain > 0, gain, -np.inf)], axis=1)
+    C = np.concatenate([np.zeros((n, 1)), cost], axis=1)
+
+    # Başlangıç: maliyetsiz seçenekler arasındaki en iyi kazanç (bütçe harcamaz)
+    start = np.argmax(np.where(C == 0, G, -np.inf), axis=1)
+    rows = np.arange(n)
+    cur = start.copy()
+    cur_g, cur_c = G[rows, cur], C[rows, cur]
+
+    # Zarf adımları: mevcut noktadan en yüksek eğimli (kazanç/maliyet) sonraki teklife.
+    # Eğimler zarf boyunca artmaz; kayan nokta hatasına karşı önceki adımın eğimiyle sınırlanır.
+    steps = []
+    last_eff = np.full(n, np.inf)
+    for step in range(k):
+        dg = G - cur_g[:, None]
+        dc = C - cur_c[:, None]
+        valid = (dc > 0) & (dg > 0)
+        eff = np.where(valid, dg / np.where(dc > 0, dc, 1), -np.inf)
+        nxt = np.argmax(eff, axis=1)
+        has = valid.any(axis=1)
+        if not has.any():
+            break
+        idx = rows[has]
+        last_eff[idx] = np.minimum(eff[idx, nxt[has]], last_eff[idx])
+        steps.append((idx, np.full(len(idx), step), nxt[has], dc[idx, nxt[has]], last_eff[idx]))
+        cur[has] = nxt[has]
+        cur_g[has], cur_c[has] = G[idx, nxt[has]], C[idx, nxt[has]]
+
+    offer = start
+    if steps:
+        cust, step, target, dcost, eff = (np.concatenate(a) for a in zip(*steps))
+        # Verimliliği yüksek adımlar önce; aynı müşterinin adımları zarf sırasını korur
+        order = np.lexsort((step, -eff))
+        cust, step, target, dcost = cust[order], step[order], target[order], dcost[order]
+        taken = _greedy_fill(cust, step, dcost, budget, n, k)
+        offer = start.copy()
+        for s in range(len(steps)):
+            sel = taken & (step == s)
+            offer[cust[sel]] = target[sel]
+
+    # 1/2-yaklaşım güvencesi: bütçeye sığan en kazançlı tek teklif açgözlü plandan iyiyse o seçilir
+    single = np.where(C <= budget, G - G[rows, start][:, None], -np.inf)
+    best = np.unravel_index(np.argmax(single), single.shape) if n else None
+    if best is not None and single[best] > G[rows, offer].sum() - G[rows, start].sum():
+        offer = start.copy()
+        offer[best[0]] = best[1]
+
+    chosen_g = np.where(offer > 0, G[rows, offer], 0.0)
+    chosen_c = C[rows, offer]
+    return OfferPlan(offer=offer - 1, gain=chosen_g, cost=chosen_c, budget=budget)
+
+
+def _greedy_fill(cust, step, dcost, budget, n, k):
+    """Verimlilik sırasındaki adımları, sığmayanları atlayarak bütçeye yerleştirir.
+
+    Bir müşterinin adımı ancak aynı müşterinin önceki adımı alındıysa alınabilir.
+    Her turda alınabilir adımların sığan öneki birlikte alınır; öneki bitiren (sığmayan)
+    adım ve ona bağlı sonraki adımlar elenir. Sonuç, adımları tek tek gezen açgözlü
+    doldurmayla aynıdır. Alınan adımların maskesini döndürür.
+    """
+    pos = np.full(n * k, -1, dtype=np.int64)
+    pos[cust * k + step] = np.arange(len(cust))
+    pred = np.where(step > 0, pos[cust * k + np.maximum(step - 1, 0)], -1)
+    levels = [np.flatnonzero(step == s) for s in range(1, k)]
+
+    taken = np.zeros(len(cust), dtype=bool)
+    dropped = np.zeros(len(cust), dtype=bool)
+    remaining = float(budget)
+    while True:
+        open_ = ~taken & ~dropped & (dcost <= remaining)
+        for idx in levels:
+            open_[idx] &= taken[pred[idx]] | open_[pred[idx]]
+        dropped |= ~taken & ~open_
+        cand = np.flatnonzero(open_)
+        if not len(cand):
+            return taken
+        fits = np.cumsum(dcost[cand]) <= remaining
+        stop = len(cand) if fits.all() else int(np.argmin(fits))
+        taken[cand[:stop]] = True
+        remaining -= float(dcost[cand[:stop]].sum())
+        if stop < len(cand):
+            dropped[cand[stop]] = True
+
+
+def plan_summary(scores, plan):
+    """Teklif bazında atanan müşteri, maliyet ve beklenen kurtarılan gelir tablosu."""
+    names = [o.name for o in scores.offers]
+    assigned = plan.offer >= 0
+    idx = plan.offer[assigned]
+    return pd.DataFrame({
+        'Teklif': names,
+        'Müşteri Sayısı': np.bincount(idx, minlength=len(names)),
+        'İndirim Maliyeti ($)': np.bincount(idx, weights=plan.cost[assigned], minlength=len(names)),
+        'Beklenen Kurtarılan Gelir ($)': np.bincount(idx, weights=plan.gain[assigned], minlength=len(names)),
+    })
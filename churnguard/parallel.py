@@ -0,0 +1,63 @@
+import math
+
+import joblib
+import numpy as np
+
+from churnguard.config import N_JOBS
+from churnguard.scoring import predict_risk
+
+# Bu eşiğin altındaki girdiler süreç havuzuna gönderilmeden yerinde skorlanır
+MIN_PARALLEL_ROWS = 20_000
+SHARD_ROWS = 250_000
+
+# İşçi süreç başına model önbelleği: her işçi modeli yalnızca bir kez yükler
+_WORKER_MODELS = {}
+
+
+def _worker_model(model_path):
+    model = _WORKER_MODELS.get(model_path)
+    if model is None:
+        # sklearn ağaçları yüklenirken düğüm dizilerini kopyaladığından her işçi modelin
+        # kendi kopyasını tutar; bellek kullanımı işçi sayısıyla doğrusal artar
+        model = joblib.load(model_path)
+        _WORKER_MODELS[model_path] = model
+    return model
+
+
+def _score_shard(model_path, X):
+    return predict_risk(_worker_model(model_path), X)
+
+
+class ParallelScorer:
+    """Kodlanmış matrisi parçalara bölüp süreç havuzunda skorlayan çağrılabilir nesne.
+
+    Sonuçlar orijinal satır sırasıyla birleştirilir; tek çekirdekli skorlamayla
+    birebir aynıdır. Küçük girdiler ve n_jobs=1 için yerinde skorlamaya düşer.
+    """
+
+    def __init__(self, model_path, n_jobs=None, model=None,
+                 min_parallel_rows=MIN_PARALLEL_ROWS, shard_rows=SHARD_ROWS):
+        self.model_path = model_path
+        self.n_jobs = max(1, n_jobs or N_JOBS)
+        self.min_parallel_rows = min_parallel_rows
+        self.shard_rows = shard_rows
+        self._model = model
+
+    @property
+    def model(self):
+        if self._model is None:
+            self._model = _worker_model(self.model_path)
+        return self._model
+
+    def __call__(self, X):
+        n = len(X)
+        if self.n_jobs == 1 or n < self.min_parallel_rows:
+            return predict_risk(self.model, X)
+
+        n_shards = max(self.n_jobs, math.ceil(n / self.shard_rows))
+        shards = np.array_split(X, n_shards)
+        # Büyük parçalar joblib tarafından işçilere bellek eşlemli (memmap) aktarılır
+        results = joblib.Parallel(n_jobs=self.n_jobs, backend='loky', max_nbytes='1M', mmap_mode='r')(
+            joblib.delayed(_score_shard)(self.model_path, shard) for shard in shards
+        )
+        return np.concatenate(results)
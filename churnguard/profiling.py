@@ -0,0 +1,83 @@
+"""Boru hattı aşamaları için duvar saati ve (isteğe bağlı) tepe bellek ölçümü.
+
+Aynı ölçüm hem benchmark paketinde hem de uygulamadaki profil panelinde kullanılır.
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+@dataclass
+class StageTiming:
+    """Tek bir aşamanın ölçümü; bellek izlenmiyorsa `peak_mb` None'dır."""
+    name: str
+    seconds: float
+    peak_mb: float = None
+
+
+class StageProfiler:
+    """Aşama sürelerini sırayla kaydeder.
+
+    `trace_memory` açıkken her aşamanın tepe Python/NumPy bellek artışı
+    tracemalloc ile ölçülür (ölçüm maliyetlidir, yalnızca benchmark için).
+    `enabled=False` iken `stage` hiçbir şey ölçmez; uygulama kodu aynı kalır.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            peak_mb = None
+            if self.trace_memory:
+                peak_mb = max(tracemalloc.get_traced_memory()[1] - baseline, 0) / 1e6
+                if tracing:
+                    tracemalloc.stop()
+            self.stages.append(StageTiming(name, seconds, peak_mb))
+
+    def timed(self, name, fn, *args, **kwargs):
+        """`fn(*args, **kwargs)` çağrısını `name` aşaması olarak ölçer ve sonucunu döndürür."""
+        with self.stage(name):
+            return fn(*args, **kwargs)
+
+    @property
+    def total(self):
+        return sum(s.seconds for s in self.stages)
+
+    @property
+    def elapsed(self):
+        """Profilleyicinin oluşturulmasından bu yana geçen süre (ölçülmeyen arayüz işleri dahil)."""
+        return time.perf_counter() - self.started
+
+    def slowest(self):
+        return max(self.stages, key=lambda s: s.seconds) if self.stages else None
+
+    def frame(self):
+        """Ölçümleri Aşama / Süre (ms) / Pay (%) [/ Tepe Bellek (MB)] tablosu olarak döndürür."""
+        total = self.total or 1.0
+        rows = [{'Aşama': s.name, 'Süre (ms)': s.seconds * 1000, 'Pay (%)': s.seconds / total * 100}
+                for s in self.stages]
+        frame = pd.DataFrame(rows, columns=['Aşama', 'Süre (ms)', 'Pay (%)'])
+        if self.trace_memory:
+            frame['Tepe Bellek (MB)'] = [s.peak_mb for s in self.stages]
+        return frame
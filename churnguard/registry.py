@@ -0,0 +1,243 @@
+"""Sürümlü model kaydı ve bellek bütçeli, en az kullanılan modeli çıkaran model önbelleği.
+
+Dizin düzeni:
+    models/<model adı>/<sürüm>/model.pkl
+    models/<model adı>/<sürüm>/features.pkl
+    models/<model adı>/<sürüm>/meta.json   (isteğe bağlı: bölge, açıklama, metrikler)
+
+Kayıt boşsa kök dizindeki varsayılan model ('default') tek kayıt olarak sunulur.
+
+Kayıtları listeleme ve yeni sürüm ekleme:
+    python -m churnguard.registry list
+    python -m churnguard.registry register tr-bolge 3 --model model.pkl --features features.pkl --description "TR bölgesi"
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import joblib
+
+from churnguard.compiled_forest import compiled_path_for
+from churnguard.config import (FEATURES_PATH, MODEL_CACHE_SIZE, MODEL_MEMORY_BUDGET_MB, MODEL_PATH,
+                               MODEL_REGISTRY_DIR)
+from churnguard.startup import boot
+
+DEFAULT_MODEL_ID = 'default'
+MODEL_FILE = 'model.pkl'
+FEATURES_FILE = 'features.pkl'
+META_FILE = 'meta.json'
+
+
+@dataclass(frozen=True)
+class ModelEntry:
+    """Kayıttaki tek bir model sürümü (ör. 'tr-bolge@2026-01')."""
+    model_id: str
+    name: str
+    version: str
+    model_path: str
+    features_path: str
+    meta: dict = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def label(self):
+        description = self.meta.get('description')
+        return f"{self.model_id} — {description}" if description else self.model_id
+
+    @property
+    def size_bytes(self):
+        """Diskteki boyut: model dosyası + (varsa) derlenmiş orman dizileri."""
+        size = os.path.getsize(self.model_path) if os.path.exists(self.model_path) else 0
+        compiled = compiled_path_for(self.model_path)
+        if os.path.isdir(compiled):
+            size += sum(os.path.getsize(os.path.join(compiled, f)) for f in os.listdir(compiled))
+        return size
+
+
+def _version_key(version):
+    # Sayısal sürümler sayısal, diğerleri alfabetik sıralanır (v2 < v10)
+    digits = ''.join(ch for ch in version if ch.isdigit())
+    return (int(digits) if digits else -1, version)
+
+
+class ModelRegistry:
+    """Kayıt dizinindeki model/özellik çiftlerini listeler ve yeni sürüm kaydeder."""
+
+    def __init__(self, root=MODEL_REGISTRY_DIR, default_model_path=MODEL_PATH, default_features_path=FEATURES_PATH):
+        self.root = root
+        self.default_model_path = default_model_path
+        self.default_features_path = default_features_path
+
+    def entries(self):
+        """Kayıtlı tüm sürümler (ad, sürüm sırasıyla); kayıt boşsa varsayılan model."""
+        found = []
+        if os.path.isdir(self.root):
+            for name in sorted(os.listdir(self.root)):
+                model_dir = os.path.join(self.root, name)
+                if not os.path.isdir(model_dir):
+                    continue
+                for version in sorted(os.listdir(model_dir), key=_version_key):
+                    entry = self._entry(name, version)
+                    if entry is not None:
+                        found.append(entry)
+        if not found and os.path.exists(self.default_model_path):
+            found.append(ModelEntry(DEFAULT_MODEL_ID, DEFAULT_MODEL_ID, '', self.default_model_path,
+                                    self.default_features_path))
+        return found
+
+    def _entry(self, name, version):
+        path = os.path.join(self.root, name, version)
+        model_path = os.path.join(path, MODEL_FILE)
+        if not os.path.isfile(model_path):
+            return None
+        meta = {}
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.isfile(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        features_path = os.path.join(path, FEATURES_FILE)
+        if not os.path.isfile(features_path):
+            features_path = self.default_features_path
+        return ModelEntry(f'{name}@{version}', name, version, model_path, features_path, meta)
+
+    def get(self, model_id):
+        for entry in self.entries():
+            if entry.model_id == model_id:
+                return entry
+        raise KeyError(f"Kayıtlı model bulunamadı: {model_id}")
+
+    def latest(self, name=None):
+        """Verilen adın (veya ilk modelin) en yeni sürümü."""
+        entries = [e for e in self.entries() if name is None or e.name == name]
+        if not entries:
+            raise KeyError(f"Kayıtlı model bulunamadı: {name}")
+        if name is None:
+            name = entries[0].name
+        return [e for e in entries if e.name == name][-1]
+
+    def register(self, name, version, model, features, meta=None):
+        """Yeni bir sürüm yazar; model hızlı yüklensin diye sıkıştırılmadan kaydedilir."""
+        path = os.path.join(self.root, name, version)
+        if os.path.exists(os.path.join(path, MODEL_FILE)):
+            raise FileExistsError(f"{name}@{version} zaten kayıtlı")
+        os.makedirs(path, exist_ok=True)
+        joblib.dump(model, os.path.join(path, MODEL_FILE))
+        joblib.dump(list(features), os.path.join(path, FEATURES_FILE))
+        with open(os.path.join(path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta or {}, f, ensure_ascii=False, indent=2)
+        return self._entry(name, version)
+
+
+class ModelCache:
+    """Son kullanılan modelleri bellekte tutan LRU önbellek.
+
+    En fazla `max_models` model ve toplam `memory_budget_mb` tahmini boyut
+    (yüklenen varlıkların `Assets.nbytes` değeri: model ağaçları, derlenmiş orman
+    ve yaprak yolu tablosu) tutulur; sınır aşılınca en uzun süredir kullanılmayan
+    model çıkarılır.
+    Yeni yüklenen model bütçeden büyük olsa bile tek başına tutulur.
+    """
+
+    def __init__(self, registry=None, max_models=MODEL_CACHE_SIZE, memory_budget_mb=MODEL_MEMORY_BUDGET_MB):
+        self.registry = registry or ModelRegistry()
+        self.max_models = max(1, max_models)
+        self.memory_budget = memory_budget_mb * 1e6
+        self._assets = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_id):
+        """Modeli (Assets) döndürür; bellekte yoksa yükler, ısıtır ve önbelleğe alır.
+
+        Yükleme hatası olan varlıklar önbelleğe alınmaz, bir sonraki çağrıda yeniden denenir.
+        """
+        with self._lock:
+            if model_id in self._assets:
+                self._assets.move_to_end(model_id)
+                self.hits += 1
+                return self._assets[model_id]
+            # Aynı modeli eşzamanlı isteyen oturumlar tek bir yüklemeyi bekler
+            loading = self._loading.setdefault(model_id, threading.Lock())
+
+        with loading:
+            with self._lock:
+                if model_id in self._assets:
+                    self._assets.move_to_end(model_id)
+                    self.hits += 1
+                    return self._assets[model_id]
+            try:
+                entry = self.registry.get(model_id)
+                assets = boot(entry.model_path, entry.features_path)
+            finally:
+                with self._lock:
+                    self._loading.pop(model_id, None)
+            with self._lock:
+                self.misses += 1
+                if assets.report.ok:
+                    self._assets[model_id] = assets
+                    self._sizes[model_id] = assets.nbytes
+                    self._evict()
+        return assets
+
+    def resident(self):
+        """Bellekteki modeller (en eskiden en yeniye) ve tahmini boyutları."""
+        with self._lock:
+            return [(model_id, self._sizes[model_id]) for model_id in self._assets]
+
+    @property
+    def resident_bytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def evict(self, model_id):
+        with self._lock:
+            self._assets.pop(model_id, None)
+            self._sizes.pop(model_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+            self._sizes.clear()
+
+    def _evict(self):
+        while len(self._assets) > 1 and (len(self._assets) > self.max_models
+                                         or sum(self._sizes.values()) > self.memory_budget):
+            model_id, _ = self._assets.popitem(last=False)
+            self._sizes.pop(model_id, None)
+            self.evictions += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnGuard model kaydı")
+    parser.add_argument('--root', default=MODEL_REGISTRY_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help="Kayıtlı model sürümlerini listeler")
+    reg = sub.add_parser('register', help="Mevcut model/özellik dosyalarını yeni sürüm olarak kaydeder")
+    reg.add_argument('name')
+    reg.add_argument('version')
+    reg.add_argument('--model', required=True)
+    reg.add_argument('--features', required=True)
+    reg.add_argument('--description', default=None)
+    reg.add_argument('--region', default=None)
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'register':
+        meta = {k: v for k, v in (('description', args.description), ('region', args.region)) if v}
+        entry = registry.register(args.name, args.version, joblib.load(args.model), joblib.load(args.features), meta)
+        print(f"{entry.model_id} kaydedildi -> {os.path.dirname(entry.model_path)}")
+        return 0
+    for entry in registry.entries():
+        print(f"{entry.model_id:<30} {entry.size_bytes / 1e6:8.1f} MB  {entry.meta.get('description', '')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
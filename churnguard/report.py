@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from churnguard.export import EXPORT_CHUNK_ROWS
+from churnguard.segmentation import segment_customers
+from churnguard.streaming import stream_high_risk
+
+# Taramada tutulan en düşük risk; görüntüleme eşiği bunun altına inemez
+KEEP_THRESHOLD = 0.3
+
+PAGE_SIZE = 50
+
+# Raporda filtrelenebilen (düşük kardinaliteli) sütunlar
+FILTER_COLUMNS = ('Segment', 'Contract', 'InternetService', 'TechSupport', 'PaymentMethod')
+
+
+class RiskReport:
+    """Tarama sonucu üzerinde bir kez kurulan, riske göre sıralı sorgu indeksi.
+
+    Skorlar azalan sırada tutulur; bir eşiğin üstündeki satır sayısı ikili arama
+    ile bulunur. Filtre kombinasyonları için eşleşen sıra konumları bir kez
+    hesaplanıp saklanır, böylece eşik ve sayfa değişiklikleri yalnızca
+    `searchsorted` ve görünen sayfanın dilimlenmesidir.
+    """
+
+    def __init__(self, frame, score_column='Risk_Skoru', filter_columns=FILTER_COLUMNS, max_cached_filters=16):
+        scores = frame[score_column].to_numpy(dtype=np.float64)
+        if len(scores) > 1 and np.any(np.diff(scores) > 0):
+            order = np.argsort(-scores, kind='stable')
+            frame = frame.take(order).reset_index(drop=True)
+            scores = scores[order]
+        self.frame = frame
+        self.score_column = score_column
+        # searchsorted artan dizi ister: negatif skorlar artan sıradadır
+        self._neg_scores = -scores
+        self.filters = {}
+        for col in filter_columns:
+            if col in frame.columns:
+                cat = pd.Categorical(frame[col])
+                self.filters[col] = (cat.categories, cat.codes)
+        self._positions = OrderedDict()
+        self._max_cached = max_cached_filters
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def options(self, column):
+        """Filtre sütununun seçilebilir değerleri."""
+        categories, _ = self.filters[column]
+        return list(categories)
+
+    def _filter_key(self, filters):
+        return tuple(sorted((col, tuple(sorted(map(str, vals)))) for col, vals in (filters or {}).items()
+                            if vals and col in self.filters))
+
+    def positions(self, filters=None):
+        """Filtreye uyan satırların (azalan risk sırasındaki) konumları; kombinasyon başına bir kez hesaplanır."""
+        key = self._filter_key(filters)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._positions:
+                self._positions.move_to_end(key)
+                return self._positions[key]
+        mask = np.ones(len(self.frame), dtype=bool)
+        for col, values in key:
+            categories, codes = self.filters[col]
+            wanted = categories.get_indexer(pd.Index(values))
+            mask &= np.isin(codes, wanted[wanted >= 0])
+        pos = np.flatnonzero(mask)
+        with self._lock:
+            self._positions[key] = pos
+            while len(self._positions) > self._max_cached:
+                self._positions.popitem(last=False)
+        return pos
+
+    def count(self, threshold, filters=None):
+        """Eşiğin üstündeki (filtreye uyan) müşteri sayısı; O(log n)."""
+        n_above = int(np.searchsorted(self._neg_scores, -threshold, side='left'))
+        pos = self.positions(filters)
+        if pos is None:
+            return n_above
+        return int(np.searchsorted(pos, n_above, side='left'))
+
+    def view(self, threshold, filters=None, start=0, stop=None):
+        """Eşik + filtre görünümünün [start, stop) aralığındaki satırları."""
+        n = self.count(threshold, filters)
+        stop = n if stop is None else min(stop, n)
+        start = min(max(start, 0), stop)
+        pos = self.positions(filters)
+        rows = np.arange(start, stop) if pos is None else pos[start:stop]
+        return self.frame.take(rows)
+
+    def iter_view(self, threshold, filters=None, chunk_rows=EXPORT_CHUNK_ROWS, limit=None):
+        """Görünümü (en fazla `limit` satır) dışa aktarım için parça parça üretir.
+
+        Satırlar zaten azalan risk sırasında olduğundan ilk K satır sıralama gerektirmez.
+        """
+        n = self.count(threshold, filters)
+        if limit is not None:
+            n = min(n, limit)
+        for start in range(0, n, chunk_rows):
+            yield self.view(threshold, filters, start, min(start + chunk_rows, n))
+
+    def page(self, threshold, filters=None, page=0, page_size=PAGE_SIZE):
+        """Yalnızca görünen sayfanın satırlarını döndürür (sayfa numarası 0'dan başlar)."""
+        return self.view(threshold, filters, page * page_size, (page + 1) * page_size)
+
+    def n_pages(self, threshold, filters=None, page_size=PAGE_SIZE):
+        return max(-(-self.count(threshold, filters) // page_size), 1)
+
+
+def scan_risk_report(source, encoder, score_fn, threshold=KEEP_THRESHOLD, segment_medians=None, explainer=None,
+                     **kwargs):
+    """Portföyü akış halinde tarar ve sonucu RiskReport indeksi olarak döndürür.
+
+    `segment_medians=(tenure_med, charge_med)` verilirse satırlara değer segmenti eklenir.
+    `explainer` (attribution.Explainer) verilirse her müşterinin ilk 3 risk etkeni eklenir.
+    """
+    explain = explainer.describe if explainer is not None else None
+    frame = stream_high_risk(source, encoder, score_fn, threshold=threshold, explain=explain, **kwargs)
+    if segment_medians is not None and len(frame):
+        frame['Segment'] = segment_customers(frame['tenure'], frame['MonthlyCharges'], *segment_medians)
+    return RiskReport(frame)
@@ -0,0 +1,106 @@
+import itertools
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Tek bir model çağrısına giren en fazla satır (müşteri x senaryo) sayısı
+MAX_BATCH_ROWS = 500_000
+
+CONTRACT_TR = {'Month-to-month': 'Aylık', 'One year': '1 Yıllık', 'Two year': '2 Yıllık'}
+PAYMENT_TR = {'Electronic check': 'E-Çek', 'Mailed check': 'Posta', 'Bank transfer (automatic)': 'Banka', 'Credit card (automatic)': 'K.Kartı'}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Bir müşteriye uygulanan what-if müdahalesi. None alanlar mevcut değeri korur."""
+    name: str
+    discount: float = 0.0
+    contract: Optional[str] = None
+    tech_support: Optional[str] = None
+    payment_method: Optional[str] = None
+
+
+def scenario_name(discount=0.0, contract=None, tech_support=None, payment_method=None):
+    """Senaryo parametrelerinden okunabilir bir isim üretir."""
+    parts = []
+    if discount:
+        parts.append(f"%{discount * 100:.0f} İndirim")
+    if contract is not None:
+        parts.append(f"{CONTRACT_TR.get(contract, contract)} Sözleşme")
+    if tech_support is not None:
+        parts.append("Teknik Destek" if tech_support == 'Yes' else "Desteksiz")
+    if payment_method is not None:
+        parts.append(PAYMENT_TR.get(payment_method, payment_method))
+    return " + ".join(parts) if parts else "Mevcut Durum"
+
+
+def scenario_grid(discounts=(0.0, 0.10, 0.15), contracts=(None, 'One year', 'Two year'),
+                  tech_support=(None, 'Yes'), payment_methods=(None,)):
+    """İndirim x sözleşme x teknik destek x ödeme yöntemi kartezyen senaryo listesi."""
+    return [Scenario(scenario_name(d, c, t, p), d, c, t, p)
+            for d, c, t, p in itertools.product(discounts, contracts, tech_support, payment_methods)]
+
+
+class ScenarioEngine:
+    """Senaryoları tek matriste toplayıp tek model çağrısıyla skorlayan motor."""
+
+    def __init__(self, encoder, score_fn):
+        self.encoder = encoder
+        self.score_fn = score_fn
+
+    def _apply(self, X, tenure, charges, scenario):
+        if scenario.discount:
+            self.encoder.set_charges(X, tenure, np.round(charges * (1 - scenario.discount), 2))
+        if scenario.contract is not None:
+            self.encoder.set_category(X, 'Contract', scenario.contract)
+        if scenario.tech_support is not None:
+            self.encoder.set_category(X, 'TechSupport', scenario.tech_support)
+        if scenario.payment_method is not None:
+            self.encoder.set_category(X, 'PaymentMethod', scenario.payment_method)
+
+    def run(self, df, scenarios):
+        """(n_müşteri, n_senaryo) boyutlu risk matrisini döndürür.
+
+        Müşteriler, her parçada müşteri x senaryo satır sayısı MAX_BATCH_ROWS'u
+        aşmayacak şekilde bölünür; her parça tek bir model çağrısıyla skorlanır.
+        """
+        n, n_scen = len(df), len(scenarios)
+        risk = np.empty((n, n_scen), dtype=np.float64)
+        if n == 0 or n_scen == 0:
+            return risk
+
+        tenure = pd.to_numeric(df['tenure'], errors='coerce').to_numpy(dtype=np.float64)
+        charges = pd.to_numeric(df['MonthlyCharges'], errors='coerce').to_numpy(dtype=np.float64)
+        step = max(1, MAX_BATCH_ROWS // n_scen)
+        for start in range(0, n, step):
+            stop = min(start + step, n)
+            base = self.encoder.encode(df.iloc[start:stop])
+            block = np.repeat(base[None], n_scen, axis=0)
+            for s, scenario in enumerate(scenarios):
+                self._apply(block[s], tenure[start:stop], charges[start:stop], scenario)
+            probs = self.score_fn(block.reshape(-1, base.shape[1]))
+            risk[start:stop] = probs.reshape(n_scen, stop - start).T
+        return risk
+
+    def risk_surface(self, record, scenarios):
+        """Tek bir müşteri için senaryo parametreleri + risk tablosu döndürür."""
+        risk = self.run(pd.DataFrame.from_records([record]), scenarios)[0]
+        return pd.DataFrame({
+            'Senaryo': [s.name for s in scenarios],
+            'İndirim': [s.discount for s in scenarios],
+            'Sözleşme': [CONTRACT_TR.get(s.contract, '-') for s in scenarios],
+            'Teknik Destek': [s.tech_support or '-' for s in scenarios],
+            'Ödeme Yöntemi': [PAYMENT_TR.get(s.payment_method, '-') for s in scenarios],
+            'Risk': risk,
+        })
+
+    def portfolio_surface(self, df, scenarios, threshold=0.5):
+        """Senaryo bazında portföy ortalama riski ve eşik üstü müşteri sayısı."""
+        risk = self.run(df, scenarios)
+        return pd.DataFrame({
+            'Senaryo': [s.name for s in scenarios],
+            'Ortalama Risk': risk.mean(axis=0),
+            'Riskli Müşteri': (risk > threshold).sum(axis=0),
+        })
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from churnguard.config import SCORE_STORE_PATH
+from churnguard.ingestion import file_digest
+
+
+def model_version(model_path):
+    """Model dosyasının içerik özeti; model değişince tüm skorlar geçersiz sayılır."""
+    return file_digest(model_path)
+
+
+def row_hashes(frame, columns):
+    """Modelin kullandığı sütunlar üzerinden satır başına 64-bit özet (SQLite INTEGER uyumlu)."""
+    cols = [c for c in columns if c in frame.columns]
+    return pd.util.hash_pandas_object(frame[cols], index=False).to_numpy().view(np.int64)
+
+
+class ScoreStore:
+    """customerID anahtarlı kalıcı skor deposu (SQLite) ve skor geçmişi."""
+
+    def __init__(self, path=SCORE_STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scores (
+                customer_id TEXT PRIMARY KEY,
+                row_hash INTEGER NOT NULL,
+                model_version TEXT NOT NULL,
+                score REAL NOT NULL,
+                scored_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS score_history (
+                customer_id TEXT NOT NULL,
+                model_version TEXT NOT NULL,
+                score REAL NOT NULL,
+                scored_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_customer ON score_history (customer_id);
+        """)
+
+    def lookup(self, ids):
+        """Verilen müşteriler için saklı (row_hash, model_version, score) kayıtlarını döndürür."""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute('CREATE TEMP TABLE IF NOT EXISTS lookup_ids (customer_id TEXT PRIMARY KEY)')
+            cur.execute('DELETE FROM lookup_ids')
+            cur.executemany('INSERT OR IGNORE INTO lookup_ids VALUES (?)', ((i,) for i in ids))
+            rows = cur.execute("""
+                SELECT s.customer_id, s.row_hash, s.model_version, s.score
+                FROM scores s JOIN lookup_ids l ON s.customer_id = l.customer_id
+            """).fetchall()
+        return pd.DataFrame(rows, columns=['customer_id', 'row_hash', 'model_version', 'score'])
+
+    def upsert(self, ids, hashes, version, scores):
+        """Yeni/değişen müşterilerin skorlarını yazar ve geçmişe ekler."""
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        rows = list(zip(ids, hashes.tolist(), [version] * len(ids), scores.tolist(), [now] * len(ids)))
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO scores (customer_id, row_hash, model_version, score, scored_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(customer_id) DO UPDATE SET
+                    row_hash = excluded.row_hash, model_version = excluded.model_version,
+                    score = excluded.score, scored_at = excluded.scored_at
+            """, rows)
+            self._conn.executemany(
+                'INSERT INTO score_history (customer_id, model_version, score, scored_at) VALUES (?, ?, ?, ?)',
+                ((r[0], r[2], r[3], r[4]) for r in rows))
+
+    def history(self, customer_id):
+        """Bir müşterinin zaman içindeki skor geçmişi."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT scored_at, model_version, score FROM score_history WHERE customer_id = ? ORDER BY scored_at',
+                (customer_id,)).fetchall()
+        return pd.DataFrame(rows, columns=['scored_at', 'model_version', 'score'])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class IncrementalStats:
+    rows: int = 0
+    rescored: int = 0
+    reused: int = 0
+
+
+class IncrementalScorer:
+    """Parça bazlı skorlayıcı: yalnızca yeni veya değişmiş müşterileri modele gönderir.
+
+    Satır özeti ve model sürümü depodakiyle aynı olan müşterilerin skoru depodan
+    okunur; diğerleri skorlanıp depoya yazılır.
+    """
+
+    def __init__(self, store, encoder, score_fn, version, id_column='customerID'):
+        self.store = store
+        self.encoder = encoder
+        self.score_fn = score_fn
+        self.version = version
+        self.id_column = id_column
+        self.stats = IncrementalStats()
+
+    def __call__(self, chunk):
+        ids = chunk[self.id_column].astype(str).to_numpy()
+        hashes = row_hashes(chunk, self.encoder.raw_columns)
+
+        # Konumsal eşleme: reindex'in eksik satırlarda 64-bit özetleri float'a çevirmesinden kaçınılır
+        known = self.store.lookup(ids)
+        pos = pd.Index(known['customer_id']).get_indexer(ids)
+        found = pos >= 0
+        fresh = np.zeros(len(chunk), dtype=bool)
+        fresh[found] = ((known['row_hash'].to_numpy()[pos[found]] == hashes[found]) &
+                        (known['model_version'].to_numpy()[pos[found]] == self.version))
+
+        probs = np.empty(len(chunk), dtype=np.float64)
+        probs[fresh] = known['score'].to_numpy()[pos[fresh]]
+        stale = ~fresh
+        if stale.any():
+            probs[stale] = self.score_fn(self.encoder.encode(chunk[stale]))
+            self.store.upsert(ids[stale], hashes[stale], self.version, probs[stale])
+
+        self.stats.rows += len(chunk)
+        self.stats.rescored += int(stale.sum())
+        self.stats.reused += int(fresh.sum())
+        return probs
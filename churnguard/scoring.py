@@ -0,0 +1,21 @@
+import warnings
+
+import numpy as np
+
+from churnguard.encoding import get_encoder
+
+
+def predict_risk(model, X):
+    """Kodlanmış matris için terk (Churn=1) olasılıklarını döndürür."""
+    if len(X) == 0:
+        return np.empty(0, dtype=np.float64)
+    with warnings.catch_warnings():
+        # Model DataFrame ile eğitildi; sütun sırası kodlayıcı tarafından garanti
+        # edildiği için isim uyarısı burada bilgi taşımaz.
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        return model.predict_proba(X)[:, 1]
+
+
+def run_batch_prediction(df, model, features):
+    """Tüm portföyü tarayarak risk skorlarını topluca üretir."""
+    return predict_risk(model, get_encoder(features).encode(df))
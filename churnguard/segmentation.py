@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Değer matrisi segmentleri (kategori kodları bu sırayla atanır)
+SEGMENTS = ['VIP', 'Riskli Yeni', 'Sadık Eko', 'Kayıp Adayı']
+
+# Ek hizmet sahipliği analizinde sayılan servis sütunları
+SERVICE_COLUMNS = ['OnlineSecurity', 'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies', 'OnlineBackup']
+
+
+@dataclass
+class Segmentation:
+    """Veri seti başına bir kez hesaplanan segment etiketleri ve ek hizmet sayıları."""
+    segment: pd.Categorical
+    service_count: np.ndarray
+    tenure_med: float
+    charge_med: float
+
+
+def segment_customers(tenure, charges, tenure_med, charge_med):
+    """Aylık ücret ve abonelik süresini medyanlarla kıyaslayıp segment etiketler.
+
+    * VIP: yüksek ücret + uzun süre
+    * Riskli Yeni: yüksek ücret + kısa süre
+    * Sadık Eko: düşük ücret + uzun süre
+    * Kayıp Adayı: diğerleri (eksik değerler dahil)
+    """
+    high = np.asarray(charges, dtype=np.float64) >= charge_med
+    loyal = np.asarray(tenure, dtype=np.float64) >= tenure_med
+    codes = np.where(high, np.where(loyal, 0, 1), np.where(loyal, 2, 3)).astype(np.int8)
+    return pd.Categorical.from_codes(codes, categories=SEGMENTS)
+
+
+def count_services(df, columns=SERVICE_COLUMNS):
+    """Müşteri başına kullanılan ('Yes') ek servis sayısını döndürür."""
+    total = np.zeros(len(df), dtype=np.int8)
+    for col in columns:
+        if col in df.columns:
+            total += (df[col] == 'Yes').to_numpy(dtype=np.int8)
+    return total
+
+
+def compute_segmentation(df):
+    """Medyan eşikleri bir kez hesaplayıp tüm segmentasyon çıktılarını üretir."""
+    tenure_med = df['tenure'].median()
+    charge_med = df['MonthlyCharges'].median()
+    return Segmentation(
+        segment=segment_customers(df['tenure'], df['MonthlyCharges'], tenure_med, charge_med),
+        service_count=count_services(df),
+        tenure_med=tenure_med,
+        charge_med=charge_med,
+    )
@@ -0,0 +1,114 @@
+"""ChurnGuard headless skorlama sunucusu.
+
+Kullanım:
+    python -m churnguard.server --port 8080
+
+Uç noktalar:
+    POST /score    Tek kayıt ({...}), kayıt listesi ([{...}]) veya {"records": [...]};
+                   eksik/hatalı alanlı kayıtlar 400 ile ("record", "field") reddedilir
+    GET  /metrics  p50/p99 gecikme ve verim sayaçları
+    GET  /health   Canlılık kontrolü
+"""
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from churnguard.config import FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import RecordError
+from churnguard.service import DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT_MS, ScoringService
+
+REQUEST_TIMEOUT_S = 30
+
+
+class ScoringServer(ThreadingHTTPServer):
+    # Çağrı merkezi yükünde eşzamanlı bağlantıların reddedilmemesi için geniş kabul kuyruğu
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def make_handler(service):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, {'status': 'ok'})
+            elif self.path == '/metrics':
+                self._send(200, service.metrics.snapshot())
+            else:
+                self._send(404, {'error': 'Bulunamadı'})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send(404, {'error': 'Bulunamadı'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'null')
+            except (ValueError, json.JSONDecodeError):
+                self._send(400, {'error': 'Geçersiz JSON'})
+                return
+
+            single = isinstance(payload, dict) and 'records' not in payload
+            records = [payload] if single else payload.get('records') if isinstance(payload, dict) else payload
+            if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+                self._send(400, {'error': 'Kayıt (obje) veya kayıt listesi bekleniyor'})
+                return
+
+            try:
+                scores = service.score_records(records, timeout=REQUEST_TIMEOUT_S)
+            except RecordError as exc:
+                self._send(400, {'error': str(exc), 'record': exc.index, 'field': exc.field})
+                return
+            except Exception as exc:
+                self._send(500, {'error': str(exc)})
+                return
+            if single:
+                self._send(200, {'score': float(scores[0])})
+            else:
+                self._send(200, {'scores': [float(s) for s in scores]})
+
+        def log_message(self, format, *args):
+            # İstek başına erişim günlüğü yüksek yükte gecikmeyi artırır; metrikler /metrics'te
+            pass
+
+    return ScoringHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnGuard headless skorlama sunucusu")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--features', default=FEATURES_PATH)
+    parser.add_argument('--model-id', default=None, help="Model kaydından sürüm (ör. tr-bolge@3); --model/--features yerine")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Mikro-toplamadaki en fazla satır")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS, help="Toplama bekleme penceresi (ms)")
+    args = parser.parse_args(argv)
+
+    if args.model_id:
+        service = ScoringService.from_registry(args.model_id, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    else:
+        service = ScoringService.from_paths(args.model, args.features, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    server = ScoringServer((args.host, args.port), make_handler(service))
+    print(service.startup.summary())
+    print(f"ChurnGuard skorlama sunucusu http://{args.host}:{args.port} adresinde çalışıyor")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
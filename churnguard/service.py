@@ -0,0 +1,172 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from churnguard.compiled_forest import fast_score_fn
+from churnguard.config import FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import get_encoder
+from churnguard.registry import ModelRegistry
+from churnguard.startup import boot
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+class ServiceMetrics:
+    """Gecikme (p50/p99) ve verim sayaçları; son N isteğin gecikmesi tutulur."""
+
+    def __init__(self, window=10_000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.started = time.monotonic()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def observe_request(self, latency_s, failed=False):
+        with self._lock:
+            self._latencies.append(latency_s * 1000)
+            self.requests += 1
+            self.errors += int(failed)
+
+    def observe_batch(self, rows):
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+
+    def snapshot(self):
+        with self._lock:
+            lat = np.fromiter(self._latencies, dtype=np.float64)
+            uptime = time.monotonic() - self.started
+            return {
+                'requests': self.requests,
+                'rows': self.rows,
+                'batches': self.batches,
+                'errors': self.errors,
+                'avg_batch_rows': self.rows / self.batches if self.batches else 0.0,
+                'p50_ms': float(np.percentile(lat, 50)) if len(lat) else None,
+                'p99_ms': float(np.percentile(lat, 99)) if len(lat) else None,
+                'requests_per_s': self.requests / uptime if uptime else 0.0,
+                'rows_per_s': self.rows / uptime if uptime else 0.0,
+                'uptime_s': uptime,
+            }
+
+
+class MicroBatcher:
+    """Eşzamanlı istekleri kısa bir bekleme penceresinde birleştirip tek model çağrısı yapar.
+
+    İlk istek geldikten sonra en fazla `max_wait_ms` beklenir veya `max_batch`
+    satıra ulaşılınca toplu skorlama yapılır; her istek kendi Future'ını alır.
+    """
+
+    def __init__(self, score_frame, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS, metrics=None):
+        self.score_frame = score_frame
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or ServiceMetrics()
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='churnguard-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        """Kayıt listesini kuyruğa ekler; skor dizisini taşıyan bir Future döndürür."""
+        future = Future()
+        started = time.perf_counter()
+        future.add_done_callback(
+            lambda f: self.metrics.observe_request(time.perf_counter() - started, f.exception() is not None))
+        self._queue.put((records, future))
+        return future
+
+    def score(self, records, timeout=None):
+        return self.submit(records).result(timeout)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _collect(self):
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch, rows = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            records = [r for recs, _ in batch for r in recs]
+            try:
+                probs = self.score_frame(pd.DataFrame.from_records(records))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            self.metrics.observe_batch(len(records))
+            pos = 0
+            for recs, future in batch:
+                future.set_result(probs[pos:pos + len(recs)])
+                pos += len(recs)
+
+
+class ScoringService:
+    """Model ve özellik listesini bir kez yükleyen, Streamlit'ten bağımsız skorlama servisi."""
+
+    def __init__(self, model, features, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS, model_path=None,
+                 score_fn=None):
+        self.model = model
+        self.encoder = get_encoder(features)
+        # Mikro-toplamalar küçük olduğundan derlenmiş orman sklearn doğrulama maliyetinden kaçınır
+        self.score_fn = score_fn or fast_score_fn(model, model_path)
+        self.startup = None
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(self.score_frame, max_batch, max_wait_ms, self.metrics)
+
+    @classmethod
+    def from_paths(cls, model_path=MODEL_PATH, features_path=FEATURES_PATH, **kwargs):
+        """Varlıkları yükleyip ısıtır; yükleme hatasında AssetLoadError fırlatır."""
+        assets = boot(model_path, features_path, strict=True)
+        service = cls(assets.model, assets.features, model_path=model_path, score_fn=assets.score_fn, **kwargs)
+        service.startup = assets.report
+        return service
+
+    @classmethod
+    def from_registry(cls, model_id, registry=None, **kwargs):
+        """Kayıttaki bir model sürümünü ('ad@sürüm') yükleyip servis oluşturur."""
+        entry = (registry or ModelRegistry()).get(model_id)
+        return cls.from_paths(entry.model_path, entry.features_path, **kwargs)
+
+    def score_frame(self, frame):
+        """Ham Telco şemasındaki DataFrame'i doğrudan (mikro-toplama olmadan) skorlar."""
+        return self.score_fn(self.encoder.encode(frame))
+
+    def score_records(self, records, timeout=None):
+        """JSON kayıtlarını mikro-toplama kuyruğu üzerinden skorlar.
+
+        Kayıtlar kuyruğa alınmadan önce denetlenir; hatalı alan için RecordError fırlatır.
+        """
+        self.encoder.validate_records(records)
+        return self.batcher.score(records, timeout)
+
+    def close(self):
+        self.batcher.close()
@@ -0,0 +1,265 @@
+"""Birleştirilebilir özetlerle artımlı portföy KPI'ları.
+
+Oranlar sayım/toplam biriktiricileriyle, medyanlar t-digest nicelik özetiyle
+tutulur. Günlük/saatlik yeni müşteri partileri mevcut duruma eklenir; paralel
+işçilerin parça özetleri birleştirilir. Tüm geçmişin bellekte tutulması gerekmez.
+
+Kullanım:
+    python -m churnguard.sketches update gunluk_parti.csv [daha_fazla.csv ...] [--state portfoy_kpi.json]
+    python -m churnguard.sketches show [--state portfoy_kpi.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from churnguard.config import N_JOBS, STATS_PATH
+from churnguard.ingestion import CSV_DTYPES, apply_schema
+
+DEFAULT_COMPRESSION = 500
+STATS_CHUNKSIZE = 200_000
+STATS_COLUMNS = ['tenure', 'MonthlyCharges', 'Contract', 'Churn']
+
+
+class TDigest:
+    """Birleştirilebilir nicelik özeti (k1 ölçek fonksiyonlu, birleştirme tabanlı t-digest).
+
+    Ağırlıklı merkezler tutulur; kuyruklardaki merkezler küçük, medyan çevresindekiler
+    büyüktür. Boyut `compression` ile sınırlıdır, veri boyutundan bağımsızdır.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, means=None, weights=None):
+        self.compression = compression
+        self.means = np.asarray(means if means is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+        self.min = float(self.means.min()) if len(self.means) else np.inf
+        self.max = float(self.means.max()) if len(self.means) else -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Yeni değerleri ekler (NaN'lar yok sayılır)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other):
+        """Başka bir özeti bu özete katar."""
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        # Merkezler sıralanır; k1 ölçeğinde aynı tamsayı aralığına düşen komşular tek merkezde birleşir
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        w = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / w
+        self.weights = w
+
+    def quantile(self, q):
+        """Tahmini `q` niceliği; özet boşsa NaN."""
+        if not len(self.means):
+            return float('nan')
+        if len(self.means) == 1:
+            return float(self.means[0])
+        cum = np.cumsum(self.weights)
+        centers = (cum - self.weights / 2) / cum[-1]
+        # Merkezler arasında doğrusal ara değerleme; uçlarda gözlenen min/max'a uzanır
+        xs = np.r_[0.0, centers, 1.0]
+        ys = np.r_[self.min, self.means, self.max]
+        return float(np.interp(q, xs, ys))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist(),
+                'min': self.min if np.isfinite(self.min) else None, 'max': self.max if np.isfinite(self.max) else None}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data['compression'], data['means'], data['weights'])
+        if data.get('min') is not None:
+            digest.min, digest.max = data['min'], data['max']
+        return digest
+
+
+class PortfolioStats:
+    """Dashboard KPI'ları için birleştirilebilir sayım/toplam ve nicelik özetleri."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.n = 0
+        self.churn = 0
+        self.charge_sum = 0.0
+        self.churn_charge_sum = 0.0
+        self.tenure_sum = 0.0
+        self.contract = {}
+        self.tenure = TDigest(compression)
+        self.charges = TDigest(compression)
+        self.churn_charges = TDigest(compression)
+
+    @classmethod
+    def from_frame(cls, df, compression=DEFAULT_COMPRESSION):
+        return cls(compression).update(df)
+
+    def update(self, df):
+        """Yeni müşteri partisini ekler."""
+        if not len(df):
+            return self
+        is_churn = (df['Churn'] == 'Yes').to_numpy() if 'Churn' in df.columns else np.zeros(len(df), dtype=bool)
+        charges = pd.to_numeric(df['MonthlyCharges'], errors='coerce').to_numpy(dtype=np.float64)
+        tenure = pd.to_numeric(df['tenure'], errors='coerce').to_numpy(dtype=np.float64)
+
+        self.n += len(df)
+        self.churn += int(is_churn.sum())
+        self.charge_sum += float(np.nansum(charges))
+        self.churn_charge_sum += float(np.nansum(charges[is_churn]))
+        self.tenure_sum += float(np.nansum(tenure))
+        if 'Contract' in df.columns:
+            grouped = pd.Series(is_churn).groupby(df['Contract'].astype(str).to_numpy()).agg(['size', 'sum'])
+            for contract, (size, churned) in grouped.iterrows():
+                counts = self.contract.setdefault(contract, [0, 0])
+                counts[0] += int(size)
+                counts[1] += int(churned)
+        self.tenure.update(tenure)
+        self.charges.update(charges)
+        self.churn_charges.update(charges[is_churn])
+        return self
+
+    def merge(self, other):
+        """Başka bir parçanın/partinin özetini bu özete katar."""
+        self.n += other.n
+        self.churn += other.churn
+        self.charge_sum += other.charge_sum
+        self.churn_charge_sum += other.churn_charge_sum
+        self.tenure_sum += other.tenure_sum
+        for contract, (size, churned) in other.contract.items():
+            counts = self.contract.setdefault(contract, [0, 0])
+            counts[0] += size
+            counts[1] += churned
+        self.tenure.merge(other.tenure)
+        self.charges.merge(other.charges)
+        self.churn_charges.merge(other.churn_charges)
+        return self
+
+    def kpis(self):
+        """DatasetAnalytics ile aynı adlı üst düzey KPI'lar (medyanlar tahminidir)."""
+        contract_churn = pd.Series({c: churned / size * 100 for c, (size, churned) in self.contract.items() if size})
+        return {
+            'n_customers': self.n,
+            'churn_count': self.churn,
+            'kritik_esik': self.churn_charges.median(),
+            'genel_churn_orani': self.churn / self.n * 100 if self.n else float('nan'),
+            'contract_churn': contract_churn,
+            'en_riskli_sozlesme': contract_churn.idxmax() if not contract_churn.empty else "Bilinmiyor",
+            'tenure_med': self.tenure.median(),
+            'charge_med': self.charges.median(),
+            'clv_referans': (self.charge_sum / self.n) * (self.tenure_sum / self.n) if self.n else float('nan'),
+            'risk_gelir': self.churn_charge_sum,
+        }
+
+    def to_dict(self):
+        return {
+            'n': self.n, 'churn': self.churn, 'charge_sum': self.charge_sum,
+            'churn_charge_sum': self.churn_charge_sum, 'tenure_sum': self.tenure_sum, 'contract': self.contract,
+            'tenure': self.tenure.to_dict(), 'charges': self.charges.to_dict(),
+            'churn_charges': self.churn_charges.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for name in ('n', 'churn', 'charge_sum', 'churn_charge_sum', 'tenure_sum'):
+            setattr(stats, name, data[name])
+        stats.contract = {c: list(v) for c, v in data['contract'].items()}
+        for name in ('tenure', 'charges', 'churn_charges'):
+            setattr(stats, name, TDigest.from_dict(data[name]))
+        return stats
+
+    def save(self, path=STATS_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STATS_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_stats(path=STATS_PATH):
+    """Kaydedilmiş özeti yükler; henüz oluşturulmamışsa None döndürür."""
+    return PortfolioStats.load(path) if os.path.exists(path) else None
+
+
+def _file_stats(path, chunksize=STATS_CHUNKSIZE):
+    # Dosya parça parça okunur; bellekte yalnızca bir parça ve özet bulunur
+    stats = PortfolioStats()
+    reader = pd.read_csv(path, chunksize=chunksize, usecols=lambda c: c in STATS_COLUMNS, dtype=CSV_DTYPES)
+    for chunk in reader:
+        stats.update(apply_schema(chunk))
+    return stats
+
+
+def build_stats(paths, n_jobs=N_JOBS, chunksize=STATS_CHUNKSIZE):
+    """Her dosyanın özetini ayrı işçide çıkarır ve hepsini tek özette birleştirir."""
+    parts = Parallel(n_jobs=min(max(n_jobs, 1), len(paths)) or 1)(
+        delayed(_file_stats)(path, chunksize) for path in paths)
+    total = PortfolioStats()
+    for part in parts:
+        total.merge(part)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnGuard artımlı portföy KPI özetleri")
+    sub = parser.add_subparsers(dest='command', required=True)
+    upd = sub.add_parser('update', help="Yeni partileri mevcut özete ekler (yoksa oluşturur)")
+    upd.add_argument('--state', default=STATS_PATH, help="Özet dosyası")
+    upd.add_argument('batches', nargs='+', help="Telco şemasında parti CSV dosyaları")
+    upd.add_argument('--n-jobs', type=int, default=N_JOBS)
+    show = sub.add_parser('show', help="Özetten KPI'ları yazdırır")
+    show.add_argument('--state', default=STATS_PATH, help="Özet dosyası")
+    args = parser.parse_args(argv)
+
+    if args.command == 'update':
+        stats = load_stats(args.state) or PortfolioStats()
+        stats.merge(build_stats(args.batches, args.n_jobs))
+        stats.save(args.state)
+    else:
+        stats = PortfolioStats.load(args.state)
+
+    kpis = stats.kpis()
+    print(f"Müşteri: {kpis['n_customers']:,}  Terk: {kpis['churn_count']:,} (%{kpis['genel_churn_orani']:.1f})")
+    print(f"Kritik eşik (terk eden medyan ücret): {kpis['kritik_esik']:.2f} $")
+    print(f"Medyan abonelik: {kpis['tenure_med']:.1f} ay  Medyan ücret: {kpis['charge_med']:.2f} $")
+    for contract, rate in kpis['contract_churn'].items():
+        print(f"  {contract:<16} %{rate:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Uygulama ve servis açılışı: model yükleme, derleme, ısınma ve aşama süreleri."""
+import functools
+import pickle
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import joblib
+
+from churnguard.attribution import Explainer
+from churnguard.compiled_forest import fast_score_fn, load_or_compile
+from churnguard.config import FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import get_encoder
+from churnguard.scoring import predict_risk
+
+# Isınma tahmininde kullanılan temsili müşteri (tüm kodlama yolları en az bir kez çalışır)
+WARMUP_RECORD = {
+    'tenure': 12, 'MonthlyCharges': 70.0, 'TotalCharges': 840.0, 'SeniorCitizen': 0,
+    'gender': 'Female', 'Partner': 'No', 'Dependents': 'No', 'PhoneService': 'Yes',
+    'MultipleLines': 'No', 'InternetService': 'Fiber optic', 'OnlineSecurity': 'No',
+    'OnlineBackup': 'No', 'DeviceProtection': 'No', 'TechSupport': 'No', 'StreamingTV': 'No',
+    'StreamingMovies': 'No', 'Contract': 'Month-to-month', 'PaperlessBilling': 'Yes',
+    'PaymentMethod': 'Electronic check',
+}
+
+
+class AssetLoadError(Exception):
+    """Model veya özellik listesi yüklenemediğinde hangi aşamada ve dosyada olduğunu taşır."""
+
+    def __init__(self, phase, path, cause):
+        super().__init__(f"{phase}: '{path}' yüklenemedi ({type(cause).__name__}: {cause})")
+        self.phase = phase
+        self.path = path
+        self.cause = cause
+
+
+@dataclass
+class StartupReport:
+    """Açılış aşamalarının süreleri (sn) ve oluşan yükleme hataları."""
+    timings: dict = field(default_factory=dict)
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def total(self):
+        return sum(self.timings.values())
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def summary(self):
+        parts = ', '.join(f"{name} {sec * 1000:.0f} ms" for name, sec in self.timings.items())
+        return f"Açılış {self.total:.2f} sn ({parts})"
+
+
+@dataclass
+class Assets:
+    """Açılışta bir kez hazırlanan model, kodlayıcı, hızlı skor fonksiyonu ve açıklayıcı."""
+    model: object
+    features: list
+    encoder: object
+    score_fn: object
+    report: StartupReport
+    explainer: object = None
+    forest: object = None
+
+    @property
+    def nbytes(self):
+        """Yerleşik bellek tahmini: model + derlenmiş orman dizileri + yaprak yolu tablosu."""
+        size = model_nbytes(self.model) if self.model is not None else 0
+        if self.forest is not None:
+            size += self.forest.nbytes
+        return size
+
+
+def load_model(model_path=MODEL_PATH):
+    """Modeli yükler; hata durumunda aşama ve dosya bilgisiyle AssetLoadError fırlatır.
+
+    sklearn ağaçları yüklenirken düğüm dizilerini kendi belleğine kopyalar; bu yüzden
+    her süreç modelin tam bir kopyasını tutar (bellek eşlemli yükleme paylaşım sağlamaz).
+    """
+    try:
+        return joblib.load(model_path)
+    except Exception as exc:
+        raise AssetLoadError('model', model_path, exc) from exc
+
+
+def model_nbytes(model):
+    """Modelin bellekteki boyutu: ağaç topluluklarında düğüm ve değer dizileri, diğerlerinde pickle boyutu."""
+    estimators = getattr(model, 'estimators_', None)
+    if estimators and all(hasattr(e, 'tree_') for e in estimators):
+        return sum(e.tree_.__getstate__()['nodes'].nbytes + e.tree_.value.nbytes for e in estimators)
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_features(features_path=FEATURES_PATH):
+    try:
+        return list(joblib.load(features_path))
+    except Exception as exc:
+        raise AssetLoadError('features', features_path, exc) from exc
+
+
+def warm_up(model, encoder, score_fn):
+    """Tekil ve toplu skorlama yollarını bir kez çalıştırarak tembel ilklendirmeleri öne çeker."""
+    X = encoder.encode_records(WARMUP_RECORD)
+    score_fn(X)
+    predict_risk(model, X)
+
+
+def boot(model_path=MODEL_PATH, features_path=FEATURES_PATH, warmup=True, strict=False):
+    """Varlıkları aşama aşama hazırlar ve süreleri `StartupReport` içinde döndürür.
+
+    Yükleme hataları sessizce yutulmaz: `strict` ise AssetLoadError fırlatılır,
+    değilse rapora eklenir ve eksik varlıklar None olarak döner.
+    """
+    report = StartupReport()
+    model = features = encoder = score_fn = explainer = forest = None
+    try:
+        with report.phase('model'):
+            model = load_model(model_path)
+    except AssetLoadError as exc:
+        if strict:
+            raise
+        report.errors.append(str(exc))
+    try:
+        with report.phase('features'):
+            features = load_features(features_path)
+    except AssetLoadError as exc:
+        if strict:
+            raise
+        report.errors.append(str(exc))
+
+    if features is not None:
+        with report.phase('encoder'):
+            encoder = get_encoder(features)
+    if model is not None:
+        with report.phase('compile'):
+            try:
+                forest = load_or_compile(model, model_path)
+            except TypeError:
+                forest = None
+            score_fn = fast_score_fn(model, model_path, forest)
+        # Katkı açıklamaları yalnızca derlenebilen ağaç topluluklarında sunulur
+        if forest is not None and encoder is not None:
+            with report.phase('explainer'):
+                explainer = Explainer(forest, encoder)
+                forest.leaf_paths()
+    if warmup and score_fn is not None and encoder is not None:
+        with report.phase('warmup'):
+            warm_up(model, encoder, score_fn)
+    return Assets(model, features, encoder, score_fn, report, explainer, forest)
+
+
+@functools.lru_cache(maxsize=None)
+def plotting():
+    """matplotlib/seaborn'u ilk grafik çizilirken içe aktarır; (pyplot, seaborn) döndürür."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
@@ -0,0 +1,99 @@
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from churnguard.ingestion import CSV_DTYPES
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Risk raporunda taşınan ham sütunlar (Risk_Skoru tarama sırasında eklenir)
+REPORT_COLUMNS = ['customerID', 'tenure', 'Contract', 'InternetService', 'TechSupport', 'PaymentMethod', 'MonthlyCharges']
+
+
+@dataclass
+class ScanProgress:
+    """Akış taramasının parça bazlı ilerleme bilgisi."""
+    chunks: int = 0
+    rows: int = 0
+    kept: int = 0
+    bytes_read: int = 0
+    total_bytes: int = 0
+
+    @property
+    def fraction(self):
+        if not self.total_bytes:
+            return 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+
+def _open_source(source):
+    """Dosya yolu veya dosya benzeri nesneden (ör. Streamlit yüklemesi) ikili akış döndürür."""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb'), True
+    source.seek(0)
+    return source, False
+
+
+def _stream_size(handle):
+    pos = handle.tell()
+    size = handle.seek(0, os.SEEK_END)
+    handle.seek(pos)
+    return size
+
+
+def iter_scored_chunks(source, encoder, score_fn, chunksize=DEFAULT_CHUNKSIZE, extra_columns=(), progress=None,
+                       score_chunk=None):
+    """CSV'yi sabit boyutlu parçalar halinde okur; her parça için (parça, skorlar) üretir.
+
+    Yalnızca kodlayıcının ihtiyaç duyduğu sütunlar ve `extra_columns` okunur,
+    böylece bellek kullanımı dosya boyutuna değil parça boyutuna bağlı kalır.
+    `score_chunk(parça)` verilirse (ör. artımlı skorlayıcı) kodlama+skorlama yerine o kullanılır.
+    """
+    needed = set(encoder.raw_columns) | set(extra_columns)
+    handle, owned = _open_source(source)
+    try:
+        if progress is not None:
+            progress.total_bytes = _stream_size(handle)
+        # Kategorik sütunlar doğrudan kategori olarak okunur; kodlayıcı satırları yeniden hash'lemez
+        reader = pd.read_csv(handle, chunksize=chunksize, usecols=lambda c: c in needed, dtype=CSV_DTYPES)
+        for chunk in reader:
+            probs = score_chunk(chunk) if score_chunk is not None else score_fn(encoder.encode(chunk))
+            if progress is not None:
+                progress.chunks += 1
+                progress.rows += len(chunk)
+                progress.bytes_read = handle.tell()
+            yield chunk, probs
+    finally:
+        if owned:
+            handle.close()
+
+
+def stream_high_risk(source, encoder, score_fn, threshold=0.5, chunksize=DEFAULT_CHUNKSIZE,
+                     columns=REPORT_COLUMNS, on_progress=None, score_chunk=None, explain=None):
+    """Portföyü akış halinde skorlar ve yalnızca eşik üstündeki müşterileri tutar.
+
+    Dönen tablo `columns` + 'Risk_Skoru' sütunlarından oluşur ve riske göre
+    azalan sıralıdır. `on_progress(ScanProgress)` her parçadan sonra çağrılır.
+    `explain(ham satırlar)` verilirse tutulan satırlara 'Risk_Etkenleri' sütunu eklenir;
+    açıklama yalnızca eşik üstündeki satırlar için, tüm ham sütunlar elindeyken hesaplanır.
+    """
+    progress = ScanProgress()
+    parts = []
+    for chunk, probs in iter_scored_chunks(source, encoder, score_fn, chunksize, columns, progress, score_chunk):
+        mask = probs > threshold
+        kept = chunk.loc[mask, [c for c in columns if c in chunk.columns]].reset_index(drop=True)
+        kept['Risk_Skoru'] = probs[mask]
+        if explain is not None:
+            kept['Risk_Etkenleri'] = explain(chunk.loc[mask])
+        parts.append(kept)
+        progress.kept += len(kept)
+        if on_progress is not None:
+            on_progress(progress)
+
+    if not parts:
+        return pd.DataFrame(columns=list(columns) + ['Risk_Skoru'] + (['Risk_Etkenleri'] if explain else []))
+    result = pd.concat(parts, ignore_index=True)
+    order = np.argsort(-result['Risk_Skoru'].to_numpy(), kind='stable')
+    return result.take(order).reset_index(drop=True)
@@ -0,0 +1,86 @@
+"""Telco şemasında, ölçeklenebilir sentetik müşteri verisi üretimi.
+
+Kategorik sütunlar referans veri setinden satır bazında yeniden örneklenir; böylece
+sözleşme, internet, ödeme ve terk gibi kategorilerin birlikte görülme oranları
+korunur. Sayısal sütunlara gürültü eklenir ve TotalCharges yeniden türetilir.
+Üretim parça parça yapıldığından 10M satırlık dosya sabit bellekle yazılır.
+
+Kullanım:
+    python -m churnguard.synthetic sentetik_1m.csv --rows 1000000 [--seed 42]
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from churnguard.config import DEFAULT_DATA_PATH
+from churnguard.ingestion import read_telco_csv
+
+SYNTHETIC_CHUNK_ROWS = 500_000
+
+# Referans veri setindeki sayısal aralıklar
+TENURE_RANGE = (0, 72)
+CHARGE_RANGE = (18.0, 120.0)
+
+
+def _reference(reference):
+    df = read_telco_csv(reference) if isinstance(reference, str) else reference
+    return df.reset_index(drop=True)
+
+
+def iter_synthetic(n_rows, seed=0, reference=DEFAULT_DATA_PATH, chunk_rows=SYNTHETIC_CHUNK_ROWS):
+    """Toplam `n_rows` satırı `chunk_rows` boyutlu DataFrame parçaları olarak üretir.
+
+    Aynı `seed` ile aynı veri üretilir. customerID'ler tüm parçalar boyunca benzersizdir.
+    """
+    ref = _reference(reference)
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_rows):
+        size = min(chunk_rows, n_rows - start)
+        chunk = ref.take(rng.integers(0, len(ref), size)).reset_index(drop=True)
+
+        if 'customerID' in chunk.columns:
+            chunk['customerID'] = [f'{i:08d}-SYN' for i in range(start, start + size)]
+        tenure = chunk['tenure'].to_numpy(dtype=np.float64) + rng.normal(0, 2, size)
+        chunk['tenure'] = np.clip(np.rint(tenure), *TENURE_RANGE).astype(np.int64)
+        charges = chunk['MonthlyCharges'].to_numpy(dtype=np.float64) * rng.normal(1, 0.03, size)
+        chunk['MonthlyCharges'] = np.round(np.clip(charges, *CHARGE_RANGE), 2)
+        if 'TotalCharges' in chunk.columns:
+            # Orijinal veri gibi yeni (tenure = 0) müşterilerde TotalCharges boştur
+            total = chunk['tenure'] * chunk['MonthlyCharges'] * rng.uniform(0.95, 1.05, size)
+            chunk['TotalCharges'] = np.round(total, 2).where(chunk['tenure'] > 0)
+        yield chunk
+
+
+def generate(n_rows, seed=0, reference=DEFAULT_DATA_PATH, chunk_rows=SYNTHETIC_CHUNK_ROWS):
+    """Sentetik veri setini tek DataFrame olarak döndürür (küçük/orta boyutlar için)."""
+    parts = list(iter_synthetic(n_rows, seed, reference, chunk_rows))
+    return pd.concat(parts, ignore_index=True) if parts else _reference(reference).iloc[:0]
+
+
+def write_synthetic(path, n_rows, seed=0, reference=DEFAULT_DATA_PATH, chunk_rows=SYNTHETIC_CHUNK_ROWS):
+    """Sentetik veriyi parça parça CSV'ye yazar (boş TotalCharges orijinal dosyadaki gibi ' ')."""
+    written = 0
+    for i, chunk in enumerate(iter_synthetic(n_rows, seed, reference, chunk_rows)):
+        chunk.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False, na_rep=' ')
+        written += len(chunk)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Telco şemasında sentetik müşteri verisi üretir")
+    parser.add_argument('output', help="Çıktı CSV dosyası")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reference', default=DEFAULT_DATA_PATH, help="Kategori karışımlarının alınacağı veri seti")
+    parser.add_argument('--chunk-rows', type=int, default=SYNTHETIC_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    written = write_synthetic(args.output, args.rows, args.seed, args.reference, args.chunk_rows)
+    print(f"{written:,} satır -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from churnguard.analytics import compute_analytics, compute_analytics_stream
+from churnguard.config import DEFAULT_DATA_PATH
+from churnguard.ingestion import read_telco_csv
+
+
+@pytest.fixture(scope='module')
+def both():
+    df = read_telco_csv(DEFAULT_DATA_PATH)
+    streamed, issues = compute_analytics_stream(DEFAULT_DATA_PATH, 'test', chunksize=1000)
+    assert issues == []
+    return compute_analytics(df, 'test'), streamed
+
+
+def test_exact_counts_and_rates(both):
+    full, streamed = both
+    assert streamed.n_customers == full.n_customers
+    assert streamed.churn_count == full.churn_count
+    assert streamed.genel_churn_orani == pytest.approx(full.genel_churn_orani)
+    assert streamed.risk_gelir == pytest.approx(full.risk_gelir)
+    assert streamed.clv_referans == pytest.approx(full.clv_referans)
+    assert streamed.en_riskli_sozlesme == full.en_riskli_sozlesme
+    np.testing.assert_allclose(streamed.contract_churn.sort_index(), full.contract_churn.sort_index())
+    assert streamed.payment_churn.equals(full.payment_churn)
+
+
+def test_sketched_values_are_close(both):
+    full, streamed = both
+    # Medyanlar t-digest ile yaklaşık hesaplanır
+    assert streamed.kritik_esik == pytest.approx(full.kritik_esik, rel=0.01)
+    assert streamed.tenure_med == pytest.approx(full.tenure_med, rel=0.05)
+    assert streamed.charge_med == pytest.approx(full.charge_med, rel=0.01)
+    assert streamed.high_ticket_churn == pytest.approx(full.high_ticket_churn, abs=1.0)
+    assert streamed.segmentation is None
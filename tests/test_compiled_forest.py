@@ -0,0 +1,79 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from churnguard.compiled_forest import CompiledForest, fast_score_fn, load_or_compile
+from churnguard.config import DEFAULT_DATA_PATH, FEATURES_PATH, MODEL_PATH
+from churnguard.encoding import get_encoder
+from churnguard.ingestion import read_telco_csv
+from churnguard.scoring import predict_risk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _with_missing(X, rate, seed=0):
+    X = X.astype(np.float64, copy=True)
+    X[np.random.default_rng(seed).random(X.shape) < rate] = np.nan
+    return X
+
+
+@pytest.fixture(scope='module')
+def trained():
+    """Eğitimde eksik değer gören küçük orman: düğümlerin bir kısmı NaN'ı sola yollar."""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(600, 6))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(0, 0.5, 600) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0)
+    model.fit(_with_missing(X, 0.2), y)
+    return model, rng.normal(size=(400, 6))
+
+
+def test_parity_without_missing(trained):
+    model, X = trained
+    forest = CompiledForest.from_sklearn(model)
+    np.testing.assert_allclose(forest.predict_risk(X), predict_risk(model, X), rtol=0, atol=1e-12)
+
+
+def test_parity_with_missing(trained):
+    model, X = trained
+    forest = CompiledForest.from_sklearn(model)
+    assert forest.missing_left.any() and not forest.missing_left.all()
+    X = _with_missing(X, 0.3)
+    X[0] = np.nan
+    np.testing.assert_allclose(forest.predict_risk(X), predict_risk(model, X), rtol=0, atol=1e-12)
+
+
+def test_contributions_add_up_with_missing(trained):
+    model, X = trained
+    forest = CompiledForest.from_sklearn(model)
+    X = _with_missing(X, 0.3)
+    bias, contrib = forest.contributions(X)
+    np.testing.assert_allclose(bias + contrib.sum(axis=1), predict_risk(model, X), rtol=0, atol=1e-12)
+
+
+def test_saved_forest_round_trip(trained, tmp_path):
+    model, X = trained
+    CompiledForest.from_sklearn(model).save(tmp_path)
+    forest = CompiledForest.load(tmp_path)
+    X = _with_missing(X, 0.3)
+    np.testing.assert_allclose(forest.predict_risk(X), predict_risk(model, X), rtol=0, atol=1e-12)
+
+
+@pytest.mark.skipif(not os.path.exists(os.path.join(ROOT, MODEL_PATH)), reason="model dosyası yok")
+def test_bundled_model_scores_independent_of_batch_size(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    model = joblib.load(MODEL_PATH)
+    encoder = get_encoder(joblib.load(FEATURES_PATH))
+    df = read_telco_csv(DEFAULT_DATA_PATH).head(300).copy()
+    df.loc[df.index[::3], 'tenure'] = np.nan
+    df.loc[df.index[1::3], 'MonthlyCharges'] = np.nan
+    X = encoder.encode(df)
+    assert np.isnan(X).any()
+
+    forest = load_or_compile(model, MODEL_PATH)
+    np.testing.assert_allclose(forest.predict_risk(X), predict_risk(model, X), rtol=0, atol=1e-12)
+    score = fast_score_fn(model, MODEL_PATH, forest)
+    np.testing.assert_allclose(score(X[:10]), score(np.vstack([X] * 4))[:10], rtol=0, atol=1e-12)
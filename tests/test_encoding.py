@@ -0,0 +1,33 @@
+import joblib
+import pytest
+
+from churnguard.config import FEATURES_PATH
+from churnguard.encoding import RecordError, get_encoder
+from churnguard.startup import WARMUP_RECORD
+
+
+@pytest.fixture(scope='module')
+def encoder():
+    return get_encoder(joblib.load(FEATURES_PATH))
+
+
+def test_valid_record_passes(encoder):
+    encoder.validate_records([dict(WARMUP_RECORD), dict(WARMUP_RECORD, TotalCharges=' ', tenure='12')])
+
+
+@pytest.mark.parametrize('field, value', [
+    ('tenure', 'x'), ('tenure', None), ('MonthlyCharges', 'abc'), ('MonthlyCharges', float('nan')),
+    ('SeniorCitizen', [1]), ('TotalCharges', 'abc'), ('Contract', None), ('Contract', 3),
+])
+def test_bad_field_is_named(encoder, field, value):
+    with pytest.raises(RecordError) as info:
+        encoder.validate_records([dict(WARMUP_RECORD), dict(WARMUP_RECORD, **{field: value})])
+    assert (info.value.index, info.value.field) == (1, field)
+
+
+def test_missing_field_is_named(encoder):
+    record = dict(WARMUP_RECORD)
+    del record['InternetService']
+    with pytest.raises(RecordError) as info:
+        encoder.validate_records([record])
+    assert info.value.field == 'InternetService'
@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+
+from churnguard import export
+
+
+def test_xlsx_not_offered_above_sheet_limit(monkeypatch):
+    monkeypatch.setattr(export, 'Workbook', object)
+    assert 'xlsx' in export.available_formats(export.XLSX_MAX_ROWS - 1)
+    assert 'xlsx' not in export.available_formats(export.XLSX_MAX_ROWS)
+    assert 'csv' in export.available_formats(export.XLSX_MAX_ROWS)
+
+
+def test_xlsx_writer_rejects_rows_above_limit(monkeypatch, tmp_path):
+    pytest.importorskip('openpyxl')
+    monkeypatch.setattr(export, 'XLSX_MAX_ROWS', 3)
+    chunks = [pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [3]})]
+    with pytest.raises(ValueError):
+        export.write_report(iter(chunks), str(tmp_path / 'r.xlsx'), 'xlsx')
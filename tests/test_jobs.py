@@ -0,0 +1,40 @@
+import threading
+import time
+
+from churnguard.jobs import CANCELLED, DONE, QUEUED, JobManager
+
+
+def _blocking(release, on_progress):
+    release.wait(5)
+    return 'ok'
+
+
+def test_queued_jobs_report_their_position():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    try:
+        first = manager.submit('a', _blocking, release=release)
+        second = manager.submit('b', _blocking, release=release)
+        third = manager.submit('c', _blocking, release=release)
+        assert second.status == QUEUED and third.status == QUEUED
+        assert (manager.queue_position(second), manager.queue_position(third)) == (1, 2)
+        second.cancel()
+        assert manager.queue_position(third) == 1
+    finally:
+        release.set()
+        manager.shutdown()
+    assert first.status == DONE and first.result == 'ok'
+    assert second.status == CANCELLED
+    assert manager.queue_position(first) == 0
+
+
+def test_finished_job_keeps_result_after_eviction():
+    manager = JobManager(max_workers=2, keep=1)
+    release = threading.Event()
+    release.set()
+    jobs = [manager.submit(str(i), _blocking, release=release) for i in range(4)]
+    while not all(job.done for job in jobs):
+        time.sleep(0.01)
+    manager.shutdown()
+    assert len(manager.jobs()) == 1
+    assert all(job.result == 'ok' for job in jobs)
@@ -0,0 +1,48 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from churnguard.optimizer import OfferScores, optimize_offers
+from churnguard.scenarios import Scenario
+
+OFFERS = [Scenario("A", discount=0.05), Scenario("B", discount=0.20), Scenario("C")]
+
+
+def _scores(base, offer_risk, charges, offers=OFFERS):
+    return OfferScores(list(offers), np.asarray(base, float), np.asarray(offer_risk, float), np.asarray(charges, float))
+
+
+def _brute_force(scores, budget, horizon):
+    value = scores.charges * horizon
+    discounts = np.array([o.discount for o in scores.offers])
+    gain = np.maximum((scores.base_risk[:, None] - scores.offer_risk) * value[:, None], 0)
+    cost = discounts[None, :] * value[:, None]
+    best = 0.0
+    for choice in itertools.product(range(-1, len(scores.offers)), repeat=len(value)):
+        pick = [(i, j) for i, j in enumerate(choice) if j >= 0]
+        if sum(cost[i, j] for i, j in pick) <= budget + 1e-9:
+            best = max(best, sum(gain[i, j] for i, j in pick))
+    return best
+
+
+def test_keeps_filling_after_a_step_that_does_not_fit():
+    # Pahalı ve verimli müşteri bütçeye sığmaz; ucuz müşteriler yine de teklif almalı
+    scores = _scores([0.9, 0.5, 0.5], [[0.1, 0.1, 0.9], [0.45, 0.45, 0.5], [0.45, 0.45, 0.5]],
+                     [1000.0, 10.0, 10.0], offers=OFFERS[:2] + [Scenario("C", discount=0.5)])
+    plan = optimize_offers(scores, budget=10.0, horizon=1)
+    assert plan.spent <= 10.0
+    assert (plan.offer[1:] >= 0).all()
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_within_budget_and_half_of_optimum(seed):
+    rng = np.random.default_rng(seed)
+    n = 4
+    base = rng.uniform(0.2, 0.9, n)
+    offer_risk = np.clip(base[:, None] - rng.uniform(-0.1, 0.5, (n, len(OFFERS))), 0, 1)
+    scores = _scores(base, offer_risk, rng.uniform(10, 120, n))
+    budget = rng.uniform(0, 60)
+    plan = optimize_offers(scores, budget, horizon=3)
+    assert plan.spent <= budget + 1e-9
+    assert plan.expected_saved >= 0.5 * _brute_force(scores, budget, 3) - 1e-9